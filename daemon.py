@@ -0,0 +1,226 @@
+"""
+Long-running alternative to the cron job: keeps one scraper and one database
+connection warm and refreshes users on its own schedule.
+
+Recently active users are refreshed every `daemon.min_interval` seconds; users with
+nothing new back off (doubling) up to `daemon.max_interval`. The browser is recycled
+periodically to bound memory. Every competition not run yet is scored against its
+own problem set; a competition already marked as run is left alone, so its results
+and totals stay as they were finalized. Stop with Ctrl+C or SIGTERM.
+
+    python daemon.py
+"""
+
+import asyncio
+import heapq
+import itertools
+import signal
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils.config_loader import load_config
+from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.database.db_manager import DatabaseManager
+from src.scraper.competition_index import CompetitionIndex
+from src.scraper.leetcode_scraper import LeetCodeScraper
+
+
+class RefreshScheduler:
+    """Priority queue of users ordered by when they are next due"""
+
+    def __init__(self, min_interval: float, max_interval: float):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._heap: List[Tuple[float, int, str]] = []
+        self._intervals: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+
+    def add(self, username: str, due: Optional[float] = None):
+        """Schedule a user (immediately by default)"""
+        self._intervals.setdefault(username, self.min_interval)
+        heapq.heappush(self._heap, (due if due is not None else time.monotonic(), next(self._counter), username))
+        self._changed.set()
+
+    def reschedule(self, username: str, active: bool):
+        """Schedule a user's next refresh, sooner if they were just active"""
+        if active:
+            interval = self.min_interval
+        else:
+            interval = min(self.max_interval, self._intervals.get(username, self.min_interval) * 2)
+        self._intervals[username] = interval
+        self.add(username, time.monotonic() + interval)
+
+    async def next_due(self) -> str:
+        """Wait for the next due user and remove it from the queue"""
+        while True:
+            self._changed.clear()
+            if self._heap:
+                delay = self._heap[0][0] - time.monotonic()
+                if delay <= 0:
+                    return heapq.heappop(self._heap)[2]
+            else:
+                delay = None
+
+            # Sleep until the head is due or the queue changes
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+class LeaderboardDaemon:
+    """Refreshes the current competition continuously"""
+
+    def __init__(self, config: Dict[str, Any], logger):
+        self.config = config
+        self.logger = logger
+        daemon_config = config.get('daemon') or {}
+        self.min_interval = daemon_config.get('min_interval', 300)
+        self.max_interval = daemon_config.get('max_interval', 3600)
+        self.recycle_after = daemon_config.get('recycle_after', 500)
+        self.recycle_interval = daemon_config.get('recycle_interval', 3600)
+
+        scraping_config = dict(config['scraping'])
+        if (scraping_config.get('cache') or {}).get('enabled'):
+            # Always revalidate: the scheduler already decides how often to look
+            scraping_config['cache'] = {**scraping_config['cache'], 'ttl': 0}
+        self.scraper = LeetCodeScraper.from_config(scraping_config)
+        self.db = DatabaseManager.from_config(config.get('database') or {})
+        self.scheduler = RefreshScheduler(self.min_interval, self.max_interval)
+        self.semaphore = asyncio.Semaphore(self.scraper.concurrency)
+        self.stop_event = asyncio.Event()
+
+        # Problem set of a competition created before problem sets were stored
+        self.default_problem_slugs = [p['slug'] for p in config['problems']]
+        self.since_ids: Dict[int, Dict[str, int]] = {}
+        self.in_flight: set = set()
+        self.fetches_since_recycle = 0
+        self.last_recycle = time.monotonic()
+        self.refreshes = 0
+        self.new_solves = 0
+
+    async def refresh_user(self, username: str):
+        """Scrape one user incrementally and save what is new in every competition not run yet"""
+        try:
+            comps = self.db.get_active_competitions(self.default_problem_slugs)
+            if not comps:
+                # Nothing to refresh until a new competition is created
+                self.scheduler.reschedule(username, active=False)
+                return
+
+            # Each competition is scored against its own problem set, as in main.py
+            index = CompetitionIndex(comps)
+            for competition_id in index.competition_ids:
+                if competition_id not in self.since_ids:
+                    self.since_ids[competition_id] = self.db.get_last_submission_ids(competition_id)
+            since_ids = {competition_id: self.since_ids[competition_id] for competition_id in index.competition_ids}
+            self.scraper.forget(username)
+            result = await self.scraper.get_user_competition_results(username, index, since_ids)
+            self.fetches_since_recycle += 1
+            self.refreshes += 1
+
+            if 'error' in result:
+                self.logger.warning(f"{username}: {result['error']}")
+                self.scheduler.reschedule(username, active=False)
+                return
+
+            self.db.save_competition_results([result], index.competition_ids)
+            active = False
+            solved = []
+            for competition_id, comp_result in result['competitions'].items():
+                since_id = since_ids[competition_id].get(username)
+                if comp_result['last_submission_id'] is not None:
+                    since_ids[competition_id][username] = comp_result['last_submission_id']
+                active = active or comp_result['last_submission_id'] != since_id
+                if since_id is not None:
+                    solved += [slug for slug, data in comp_result['submissions'].items() if data['solved']]
+            self.db.update_user_stats(username)
+
+            solved = list(dict.fromkeys(solved))
+            if solved:
+                self.new_solves += len(solved)
+                self.logger.success(f"{username} solved {', '.join(solved)}")
+            self.scheduler.reschedule(username, active)
+        except Exception as e:
+            self.logger.error_msg(f"Refresh failed for {username}: {str(e)}")
+            self.scheduler.reschedule(username, active=False)
+
+    def _recycle_due(self) -> bool:
+        return (self.fetches_since_recycle >= self.recycle_after
+                or time.monotonic() - self.last_recycle >= self.recycle_interval)
+
+    async def _recycle_browser(self):
+        """Wait for in-flight refreshes, then restart the browser"""
+        if self.in_flight:
+            await asyncio.wait(self.in_flight)
+        if self.scraper.context is not None:
+            await self.scraper.recycle_browser()
+            self.logger.info(f"Browser recycled after {self.fetches_since_recycle} fetches")
+        self.fetches_since_recycle = 0
+        self.last_recycle = time.monotonic()
+
+    async def _dispatch(self):
+        """Start refreshes as users come due, bounded by the scraper's concurrency"""
+        while True:
+            username = await self.scheduler.next_due()
+            if self._recycle_due():
+                await self._recycle_browser()
+
+            await self.semaphore.acquire()
+            task = asyncio.ensure_future(self.refresh_user(username))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+            task.add_done_callback(lambda _: self.semaphore.release())
+
+    async def _report(self):
+        """Log a status line and refresh the metrics files every max_interval seconds"""
+        while True:
+            await asyncio.sleep(self.max_interval)
+            leaderboard = self.db.get_leaderboard_data()
+            leader = f", leader {leaderboard[0]['username']} ({leaderboard[0]['total_score']} points)" if leaderboard else ""
+            self.logger.info(f"{self.refreshes} refreshes, {self.new_solves} new solves{leader}")
+            metrics.write()
+
+    async def run(self):
+        await self.scraper.start()
+        for username in self.config['usernames']:
+            self.scheduler.add(username)
+
+        dispatcher = asyncio.ensure_future(self._dispatch())
+        reporter = asyncio.ensure_future(self._report())
+        try:
+            await self.stop_event.wait()
+        finally:
+            dispatcher.cancel()
+            reporter.cancel()
+            if self.in_flight:
+                await asyncio.wait(self.in_flight)
+            await self.scraper.close()
+            self.db.close()
+            metrics.write()
+
+
+async def main():
+    """Daemon entry point"""
+    logger = setup_logger()
+    logger.start("Starting LeetCode Competition Bot daemon")
+
+    config = load_config()
+    daemon = LeaderboardDaemon(config, logger)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, daemon.stop_event.set)
+
+    logger.success(
+        f"Refreshing {len(config['usernames'])} users every "
+        f"{daemon.min_interval}-{daemon.max_interval}s"
+    )
+    await daemon.run()
+    logger.complete(f"Daemon stopped after {daemon.refreshes} refreshes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
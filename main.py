@@ -4,19 +4,127 @@ Example crontab entry:
     0 8 * * * cd /path/to/leetcode-bot && python main.py
 """
 
+import argparse
 import asyncio
+import os
+import socket
+import time
 from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
 from src.database.db_manager import DatabaseManager
+from src.database.writer import BatchWriter
+from src.scraper.competition_index import CompetitionIndex
 from src.scraper.leetcode_scraper import LeetCodeScraper
+from src.scraper.profile_cache import ProfileCache
+from src.scraper.rate_limiter import split_rate_limit
+from src.scraper.sharding import ShardedScraper
 
 
-async def main():
-    """Main execution function"""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options (sys.argv by default)"""
+    parser = argparse.ArgumentParser(description="Update the LeetCode competition leaderboard")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore the on-disk profile cache and fetch every profile")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an unfinished run, scraping only users not saved yet")
+    parser.add_argument('--worker', nargs='?', const='', metavar='NAME',
+                        help="Join a run shared with other workers, claiming users in leased chunks "
+                             "(NAME defaults to host-pid)")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="Number of workers sharing the run; each uses 1/N of the configured "
+                             "rate limit (default: leases.workers)")
+    return parser.parse_args(argv)
+
+
+async def log_recently_solved(logger, scraper, username: str, problem_slugs: List[str]):
+    """Show a user's recently solved problems (served from the scraper's cache)"""
+    try:
+        recently_solved = await scraper.get_user_recently_solved_problems(username)
+        logger.info(f"{username}:")
+        if recently_solved:
+            for problem in recently_solved[:20]:
+                # Check if it's a competition problem
+                if problem in problem_slugs:
+                    logger.blank(f"  ✓ {problem} (competition)")
+                else:
+                    logger.blank(f"    {problem}")
+            if len(recently_solved) > 20:
+                logger.blank(f"    ... and {len(recently_solved) - 20} more")
+        else:
+            logger.blank("    No recent submissions found")
+        logger.blank()
+    except Exception as e:
+        logger.warning(f"{username}: {str(e)}")
+        logger.blank()
+
+
+async def run_worker(logger, db: DatabaseManager, worker_id: str, competition_ids: List[int],
+                     lease_config: Dict[str, Any], scrape: Callable[[List[str]], Awaitable[None]]) -> int:
+    """
+    Claim and scrape chunks of users until no user of the run is pending
+    
+    Leases are renewed while the worker is alive. When the remaining users are all
+    leased by other workers, it waits and claims them if their leases expire (their
+    worker crashed), so the run finishes as long as one worker keeps going.
+    
+    Returns:
+        Number of users this worker claimed
+    """
+    chunk_size = lease_config.get('chunk_size', 25)
+    duration = lease_config.get('duration', 300)
+    poll_interval = lease_config.get('poll_interval', 5)
+    
+    async def renew():
+        while True:
+            await asyncio.sleep(duration / 3)
+            try:
+                db.renew_leases(competition_ids, worker_id, duration)
+            except Exception as e:
+                # e.g. "database is locked" under write contention: the leases still have
+                # two thirds of their duration left, so try again on the next tick
+                logger.warning(f"Worker {worker_id} could not renew its leases: {str(e)}")
+    
+    renewer = asyncio.ensure_future(renew())
+    claimed = 0
+    try:
+        while True:
+            chunk = db.claim_users(competition_ids, worker_id, chunk_size, duration)
+            if chunk:
+                claimed += len(chunk)
+                logger.info(f"Worker {worker_id} claimed {len(chunk)} users")
+                await scrape(chunk)
+            elif db.count_pending(competition_ids):
+                # The rest is leased (or queued for this worker's writer); check again soon
+                await asyncio.sleep(poll_interval)
+            else:
+                return claimed
+    finally:
+        renewer.cancel()
+
+
+async def run(args: argparse.Namespace, config_path: str = "config.yaml") -> Optional[Dict[str, Any]]:
+    """
+    Run the bot once: scrape every active competition, save and finalize it
+    
+    Args:
+        args: Options from parse_args
+        config_path: Configuration file to load
+    
+    Returns:
+        Run summary (users, scraped, failed, scrape_time, writer and scraper stats,
+        user_latencies in seconds, a metrics snapshot), or None if there was no
+        competition to run
+    
+    Per-stage timings and counters are written to logs/metrics.prom and
+    logs/metrics.json once a run has started, including runs that fail.
+    """
     
     # Setup logger
     logger = setup_logger()
+    metrics.reset()
     db = None
     scraper = None
     
@@ -25,110 +133,200 @@ async def main():
         
         # 1. Load configuration
         logger.start("Loading configuration...")
-        config = load_config()
+        config = load_config(config_path)
         logger.success("Configuration loaded")
         
         # 2. Initialize database
         logger.start("Initializing database...")
-        db = DatabaseManager()
+        database_config = config.get('database') or {}
+        db = DatabaseManager.from_config(database_config)
         
-        # 3. Check competition status
+        # 3. Check competition status (every competition not run yet is scored)
         logger.start("Checking competition status...")
-        comp = db.get_current_competition()
-        
-        if not comp:
-            logger.error_msg("No competition found!")
-            logger.blank()
-            logger.info("Run 'make set-comp' to create a competition first")
-            db.close()
-            return
+        comps = db.get_active_competitions([p['slug'] for p in config['problems']])
         
-        if comp['has_run']:
-            logger.error_msg(f"Competition '{comp['name']}' has already been run!")
-            logger.blank()
-            logger.info("To re-run, use 'make revert-run' first")
-            logger.warning("This is a safety check to prevent accidental data overwrites")
+        if not comps:
+            comp = db.get_current_competition()
+            if not comp:
+                logger.error_msg("No competition found!")
+                logger.blank()
+                logger.info("Run 'make set-comp' to create a competition first")
+            else:
+                logger.error_msg(f"Competition '{comp['name']}' has already been run!")
+                logger.blank()
+                logger.info("To re-run, use 'make revert-run' first")
+                logger.warning("This is a safety check to prevent accidental data overwrites")
             db.close()
             return
         
-        logger.success(f"Competition '{comp['name']}' ready to run")
+        for comp in comps:
+            logger.success(f"Competition '{comp['name']}' ready to run ({len(comp['problem_slugs'])} problems)")
         
         # 3. Start scraper
         logger.start("Starting scraper...")
-        scraper = LeetCodeScraper(
-            headless=config['scraping']['headless'],
-            timeout=config['scraping']['timeout']
-        )
+        scraping_config = config['scraping']
+        if args.no_cache:
+            scraping_config['cache'] = {**(scraping_config.get('cache') or {}), 'enabled': False}
+        worker_id = None
+        if args.worker is not None:
+            worker_id = args.worker or f"{socket.gethostname()}-{os.getpid()}"
+            # Every worker applies the rate limit itself, so each gets its share of it
+            workers = args.workers or (config.get('leases') or {}).get('workers', 1)
+            scraping_config = split_rate_limit(scraping_config, workers)
+            if workers > 1 and scraping_config.get('rate_limit'):
+                logger.info(f"Rate limit split between {workers} workers")
+        sharding_config = scraping_config.get('sharding') or {}
+        if sharding_config.get('enabled'):
+            scraper = ShardedScraper(scraping_config, workers=sharding_config.get('workers'))
+            logger.info(f"Sharding users across {scraper.workers} worker processes")
+        else:
+            scraper = LeetCodeScraper.from_config(scraping_config)
         await scraper.start()
         logger.success("Scraper started")
         
-        # 4. Scrape all users
-        logger.start(f"Scraping LeetCode data for {len(config['usernames'])} users...")
-        problem_slugs = [p['slug'] for p in config['problems']]
+        # 4. Scrape all users (or, when resuming, the ones the last run didn't save).
+        # Workers always continue the shared journal, whichever worker starts first.
+        resume = args.resume or worker_id is not None
+        journals = [db.get_run_journal(comp['id']) for comp in comps]
+        if worker_id:
+            logger.info(f"Worker {worker_id} joining the run ({sum(j['saved'] for j in journals)} results already saved)")
+        elif args.resume:
+            logger.info(f"Resuming run: {sum(j['saved'] for j in journals)} results already saved")
+        elif any(j['pending'] or j['failed'] for j in journals):
+            logger.warning("The last run did not finish; starting over (use --resume to continue it)")
+        remaining = set()
+        for comp in comps:
+            remaining.update(db.start_run_journal(comp['id'], config['usernames'], resume=resume))
+        usernames = [username for username in dict.fromkeys(config['usernames']) if username in remaining]
         
-        # First, get all recently solved problems for each user
-        logger.blank()
-        for username in config['usernames']:
-            try:
-                recently_solved = await scraper.get_user_recently_solved_problems(username)
-                logger.info(f"{username}:")
-                if recently_solved:
-                    for problem in recently_solved[:20]:
-                        # Check if it's a competition problem
-                        if problem in problem_slugs:
-                            logger.blank(f"  ✓ {problem} (competition)")
-                        else:
-                            logger.blank(f"    {problem}")
-                    if len(recently_solved) > 20:
-                        logger.blank(f"    ... and {len(recently_solved) - 20} more")
-                else:
-                    logger.blank("    No recent submissions found")
-                logger.blank()
-            except Exception as e:
-                logger.warning(f"{username}: {str(e)}")
-                logger.blank()
+        # Each profile is fetched once and scored against every competition's problem set
+        index = CompetitionIndex(comps)
+        problem_slugs = index.all_slugs
+        logger.start(f"Scraping LeetCode data for {len(usernames)} users across {len(comps)} competitions...")
         
-        # Now scrape with competition problems filter
-        results = await scraper.scrape_all_users(config['usernames'], problem_slugs)
-        logger.success(f"Data scraped for {len(results)} users")
+        # Users scraped before only need submissions newer than the last one processed
+        since_ids = {comp['id']: db.get_last_submission_ids(comp['id']) for comp in comps}
+        incremental = set().union(*since_ids.values())
+        if incremental:
+            logger.info(f"Incremental scrape for {len(incremental)} previously processed users")
         
-        # 5. Save to database
-        logger.start("Saving to database...")
-        for user_result in results:
+        # Each result is logged and queued for the database writer as soon as it is
+        # scraped, so saving overlaps scraping and a crash only loses what is queued
+        writer = BatchWriter.from_config(database_config, index.competition_ids)
+        await writer.start()
+        scraped_users = 0
+        failed_users = 0
+        
+        async def handle_result(user_result):
+            nonlocal scraped_users, failed_users
             username = user_result['username']
             if 'error' in user_result:
-                logger.warning(f"Error for {username}: {user_result['error']}")
-                continue
-            
-            for problem_slug, submission_data in user_result['submissions'].items():
-                db.save_submission(
-                    username=username,
-                    problem_slug=problem_slug,
-                    solved=submission_data['solved'],
-                    competition_id=comp['id'],
-                    solved_at=None  # TODO: Get actual solve time if available
-                )
-            
-            db.update_user_stats(username)
-        
-        logger.success("Data saved successfully")
-        
-        # 6. Mark competition as run
-        logger.start("Marking competition as complete...")
-        db.mark_competition_run(comp['id'])
-        logger.success("Competition marked as complete")
+                # Already retried while scraping; don't fetch a failing profile again
+                failed_users += 1
+                logger.warning(f"{username}: {user_result['error']}")
+                logger.blank()
+            else:
+                scraped_users += 1
+                await log_recently_solved(logger, scraper, username, problem_slugs)
+            # Failures go through the writer too, so the run journal records them
+            await writer.put(user_result)
+        
+        async def scrape(chunk: List[str]):
+            await scraper.scrape_competitions(chunk, index, since_ids, on_result=handle_result)
+        
+        logger.blank()
+        scrape_start = time.perf_counter()
+        try:
+            if worker_id is None:
+                await scrape(usernames)
+            else:
+                await run_worker(logger, db, worker_id, index.competition_ids, config.get('leases') or {}, scrape)
+        finally:
+            await writer.close()
+            if worker_id is not None:
+                # Let other workers take over whatever this worker didn't finish
+                db.release_leases(index.competition_ids, worker_id)
+        scrape_time = time.perf_counter() - scrape_start
+        logger.success(f"Data scraped for {scraped_users + failed_users} users")
+        
+        scraper_stats = scraper.stats()
+        logger.info(f"Profile cache: {scraper_stats['profiles_fetched']} fetches, {scraper_stats['cache_hits']} hits")
+        if 'disk_cache_hits' in scraper_stats:
+            hit_rate = ProfileCache.hit_rate(scraper_stats['disk_cache_hits'], scraper_stats['disk_cache_revalidated'],
+                                             scraper_stats['disk_cache_misses'])
+            logger.info(
+                f"Disk cache: {scraper_stats['disk_cache_hits']} fresh, "
+                f"{scraper_stats['disk_cache_revalidated']} revalidated, "
+                f"{scraper_stats['disk_cache_misses']} fetched ({hit_rate:.0%} hit rate)"
+            )
+        if scraping_config.get('http', {}).get('enabled'):
+            logger.info(f"HTTP fast path: {scraper_stats['http_fallbacks']} fallbacks to browser")
+        if scraper_stats['retries'] or scraper_stats['throttled'] or scraper_stats.get('circuit_opens'):
+            logger.warning(
+                f"Throttling: {scraper_stats['throttled']} throttled requests, "
+                f"{scraper_stats['retries']} retries, "
+                f"circuit breaker opened {scraper_stats.get('circuit_opens', 0)} times"
+            )
+        if scraper_stats['browser_started'] and 'blocked_requests' in scraper_stats:
+            logger.info(
+                f"Blocked {scraper_stats['blocked_requests']} of "
+                f"{scraper_stats['blocked_requests'] + scraper_stats['allowed_requests']} browser requests, "
+                f"{scraper_stats['transferred_bytes'] / 1024:.0f} KiB transferred"
+            )
+        
+        # 5. Finish saving (submissions were written in batches while scraping)
+        logger.start("Saving to database...")
+        journals = [db.get_run_journal(comp['id']) for comp in comps]
+        db.refresh_user_stats(sorted(set().union(*(j['saved_users'] for j in journals))))
+        
+        write_stats = writer.stats()
+        logger.success(
+            f"Data saved successfully ({write_stats['rows_written']} submission rows written "
+            f"in {write_stats['batches']} batches, {write_stats['write_time']:.2f}s in the database)"
+        )
+        failed = set().union(*(j['errors'] for j in journals))
+        if failed:
+            logger.warning(f"{len(failed)} users failed and have no results this run")
+        
+        # 6. Mark competitions as run (with several workers, the first one to get here does it)
+        logger.start("Marking competitions as complete...")
+        marked = [comp for comp in comps if db.mark_competition_run(comp['id'])]
+        if marked:
+            logger.success(f"{len(marked)} competitions marked as complete")
+        else:
+            logger.info("Competitions were already marked as complete by another worker")
         
         # 7. Display leaderboard summary
-        leaderboard = db.get_leaderboard_data()
-        logger.complete(f"Bot completed! {len(leaderboard)} users tracked")
+        leaderboards = [(comp, db.get_leaderboard_data(comp['id'])) for comp in comps]
+        logger.complete(f"Bot completed! {max(len(lb) for _, lb in leaderboards)} users tracked")
+        
+        # Display leaderboards
+        for comp, leaderboard in leaderboards:
+            if leaderboard:
+                logger.blank()
+                logger.info(f"Leaderboard ({comp['name']}):")
+                for i, user in enumerate(leaderboard, 1):
+                    logger.blank(f"  {i}. {user['username']}: {user['total_score']} points ({user['problems_solved']} solved)")
+                logger.blank()
+        
+        db_cache = db.cache_stats()
+        logger.info(f"DB cache: {db_cache['hits']} hits, {db_cache['misses']} misses ({db_cache['hit_rate']:.0%} hit rate)")
+        
+        logger.info(f"Timing summary ({scrape_time:.1f}s scraping):")
+        for line in metrics.summary():
+            logger.blank(f"  {line}")
+        logger.blank()
         
-        # Display leaderboard
-        if leaderboard:
-            logger.blank()
-            logger.info("Leaderboard:")
-            for i, user in enumerate(leaderboard, 1):
-                logger.blank(f"  {i}. {user['username']}: {user['total_score']} points ({user['problems_solved']} solved)")
-            logger.blank()
+        return {
+            'users': len(usernames),
+            'scraped': scraped_users,
+            'failed': failed_users,
+            'scrape_time': scrape_time,
+            'writer': write_stats,
+            'scraper': scraper_stats,
+            'user_latencies': list(scraper.user_latencies),
+            'metrics': metrics.snapshot()
+        }
         
     except Exception as e:
         logger.error_msg(f"Bot failed: {str(e)}")
@@ -137,10 +335,12 @@ async def main():
     finally:
         if scraper:
             await scraper.close()
+            prom_path, json_path = metrics.write()
+            logger.info(f"Metrics written to {prom_path} and {json_path}")
         if db:
             db.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run(parse_args()))
 
@@ -0,0 +1,84 @@
+"""Benchmark per-row vs. batched submission writes"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.utils.logger import setup_logger
+
+
+def make_results(users: int, problems: int) -> List[Dict[str, Any]]:
+    """Synthetic scrape results: every user has a status for every problem"""
+    return [
+        {
+            'username': f"user{u}",
+            'submissions': {
+                f"problem-{p}": {'solved': (u + p) % 3 == 0, 'problem_slug': f"problem-{p}"}
+                for p in range(problems)
+            },
+            'last_submission_id': 1_000_000 + u
+        }
+        for u in range(users)
+    ]
+
+
+def setup_db(path: Path, problems: int) -> Tuple[DatabaseManager, int]:
+    db = DatabaseManager(str(path))
+    comp_id = db.create_competition("Benchmark", "2026-01-01", "2026-01-08")
+    db.init_problems([
+        {'slug': f"problem-{p}", 'title': f"Problem {p}", 'difficulty': 'Easy', 'points': 1}
+        for p in range(problems)
+    ])
+    return db, comp_id
+
+
+def per_row(db: DatabaseManager, comp_id: int, results: List[Dict[str, Any]]):
+    """The previous write path: one commit per (user, problem)"""
+    for user_result in results:
+        for problem_slug, submission_data in user_result['submissions'].items():
+            db.save_submission(user_result['username'], problem_slug, submission_data['solved'], comp_id)
+        db.set_last_submission_id(user_result['username'], comp_id, user_result['last_submission_id'])
+
+
+def batched(db: DatabaseManager, comp_id: int, results: List[Dict[str, Any]]):
+    db.save_results(results, comp_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--problems', type=int, default=10)
+    args = parser.parse_args()
+
+    logger = setup_logger()
+    results = make_results(args.users, args.problems)
+    rows = args.users * args.problems
+    logger.info(f"Write benchmark: {args.users} users x {args.problems} problems = {rows} rows")
+    logger.blank()
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in (('per-row (before)', per_row), ('batched (after)', batched)):
+            db, comp_id = setup_db(Path(tmp) / f"{name.split()[0]}.sqlite", args.problems)
+            start = time.perf_counter()
+            write(db, comp_id, results)
+            timings[name] = time.perf_counter() - start
+
+            db.cursor.execute("SELECT COUNT(*) FROM submissions")
+            written = db.cursor.fetchone()[0]
+            db.close()
+            logger.blank(f"  {name:<18} {timings[name]:8.3f} s   {rows / timings[name]:10.0f} rows/s   ({written} rows)")
+
+    logger.blank()
+    logger.complete(f"Batched writes are {timings['per-row (before)'] / timings['batched (after)']:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark per-profile DOM extraction against a saved profile page"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import List
+
+from playwright.async_api import async_playwright, Locator
+
+from src.scraper.leetcode_scraper import LeetCodeScraper
+from src.utils.logger import setup_logger
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'profile.html'
+
+
+async def extract_per_link(scraper: LeetCodeScraper, submission_links: Locator) -> List[str]:
+    """The previous extraction: several Playwright calls per link, list-based dedup"""
+    count = await submission_links.count()
+    solved_problems = []
+
+    for i in range(count):
+        link = submission_links.nth(i)
+        title_elem = link.locator('[data-title]')
+
+        if await title_elem.count() > 0:
+            title = await title_elem.get_attribute('data-title')
+            if title:
+                slug = scraper.title_to_slug(title)
+                if slug not in solved_problems:
+                    solved_problems.append(slug)
+
+    return solved_problems
+
+
+async def time_extraction(extract, submission_links: Locator, iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await extract(submission_links)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run(fixture: Path, iterations: int):
+    logger = setup_logger()
+    scraper = LeetCodeScraper()
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(fixture.read_text())
+        submission_links = page.locator('a[href^="/submissions/detail/"]')
+
+        link_count = await submission_links.count()
+        before = await extract_per_link(scraper, submission_links)
+        after = await scraper.extract_solved_problems(submission_links)
+        if before != after:
+            logger.error_msg(f"Extraction mismatch: {before} != {after}")
+            await browser.close()
+            sys.exit(1)
+
+        results = {
+            'per-link (before)': await time_extraction(lambda links: extract_per_link(scraper, links), submission_links, iterations),
+            'single evaluate (after)': await time_extraction(scraper.extract_solved_problems, submission_links, iterations),
+        }
+        await browser.close()
+
+    logger.info(f"Extraction benchmark: {fixture.name}, {link_count} links, {len(after)} unique slugs, {iterations} iterations")
+    logger.blank()
+    for name, timings in results.items():
+        logger.blank(f"  {name:<24} median {statistics.median(timings):7.2f} ms   "
+                     f"mean {statistics.mean(timings):7.2f} ms   min {min(timings):7.2f} ms")
+    logger.blank()
+
+    speedup = statistics.median(results['per-link (before)']) / statistics.median(results['single evaluate (after)'])
+    logger.complete(f"Single evaluate is {speedup:.1f}x faster per profile")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixture', type=Path, default=FIXTURE)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.fixture, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark dict vs. compact result rows on a large submissions table"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.utils.logger import setup_logger
+
+
+def populate(path: Path, users: int, problems: int):
+    """Write users x problems submission rows into one competition"""
+    db = DatabaseManager(str(path))
+    db.init_problems([
+        {'slug': f"problem-{p}", 'title': f"Problem {p}", 'difficulty': 'Easy', 'points': 1}
+        for p in range(problems)
+    ])
+    comp_id = db.create_competition("Benchmark", "2026-01-01", "2026-01-08")
+    db.save_results([
+        {
+            'username': f"user{u}",
+            'submissions': {f"problem-{p}": {'solved': (u + p) % 3 == 0} for p in range(problems)}
+        }
+        for u in range(users)
+    ], comp_id)
+    db.close()
+
+
+def measure(call: Callable[[], object]) -> Tuple[float, int, int]:
+    """Run call() and return (best seconds of 3, peak bytes, bytes still held by the result)"""
+    elapsed = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        call()
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    # Memory is traced in a separate run: tracing slows allocation down
+    tracemalloc.start()
+    result = call()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--problems', type=int, default=10)
+    args = parser.parse_args()
+
+    logger = setup_logger()
+    rows = args.users * args.problems
+    logger.info(f"Row benchmark: {rows} submission rows")
+    logger.blank()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rows.sqlite"
+        populate(path, args.users, args.problems)
+
+        results = {}
+        for row_type in ('dict', 'compact'):
+            db = DatabaseManager(str(path), row_type=row_type)
+            db.get_current_competition()  # warm the competition and problem cache
+            db._problem_catalog()
+            results[row_type] = {
+                'list': measure(lambda: db.get_all_submissions(all_competitions=True)),
+                'stream': measure(lambda: sum(1 for _ in db.iter_all_submissions(all_competitions=True)))
+            }
+            db.close()
+
+    for mode in ('list', 'stream'):
+        for row_type in ('dict', 'compact'):
+            elapsed, peak, held = results[row_type][mode]
+            logger.blank(
+                f"  {mode:<6} {row_type:<8} {elapsed:7.3f} s   {rows / elapsed:9.0f} rows/s   "
+                f"peak {peak / 2**20:7.1f} MiB   held {held / 2**20:7.1f} MiB"
+            )
+
+    dict_time, dict_peak, _ = results['dict']['list']
+    compact_time, compact_peak, _ = results['compact']['list']
+    logger.blank()
+    logger.complete(
+        f"Compact rows: {dict_peak / compact_peak:.1f}x less peak memory, "
+        f"{dict_time / compact_time:.1f}x faster for a full list"
+    )
+
+
+if __name__ == "__main__":
+    main()
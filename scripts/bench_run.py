@@ -0,0 +1,148 @@
+"""Benchmark full runs (main.py end to end) against the local LeetCode stub and a temp database"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import copy
+import json
+import resource
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any
+
+import yaml
+
+from leetcode_stub import start_stub_server
+from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
+from src.utils.logger import setup_logger
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def bench_config(base_config: Dict[str, Any], base_url: str, users: int, db_path: Path,
+                 browser: bool, concurrency: int) -> Dict[str, Any]:
+    """The repo's config pointed at the stub, with a synthetic roster and politeness limits off"""
+    config = copy.deepcopy(base_config)
+    config['usernames'] = [f"bench-user-{i}" for i in range(users)]
+    config['database'] = {**(config.get('database') or {}), 'path': str(db_path)}
+
+    scraping = config['scraping']
+    scraping['concurrency'] = concurrency or scraping.get('concurrency', 1)
+    scraping['profile_url'] = f"{base_url}/u/{{username}}/"
+    scraping['http'] = {**(scraping.get('http') or {}), 'enabled': not browser, 'base_url': base_url}
+    scraping['cache'] = {'enabled': False}
+    scraping['sharding'] = {'enabled': False}
+    # Measure the pipeline itself: the stub never throttles
+    for key in ('rate_limit', 'retry', 'circuit_breaker'):
+        scraping.pop(key, None)
+    return config
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (0 for no values)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def run_child(config_path: str):
+    """Set up the competition and run main.py's flow in this process, printing a JSON summary"""
+    sys.path.insert(0, str(ROOT))
+    import main as bot
+
+    config = load_config(config_path)
+    db = DatabaseManager.from_config(config['database'])
+    db.init_problems(config['problems'])
+    db.create_competition(config['competition']['name'], config['competition']['start_date'],
+                          config['competition']['end_date'], [p['slug'] for p in config['problems']])
+    db.close()
+
+    summary = asyncio.run(bot.run(bot.parse_args(['--no-cache']), config_path))
+    latencies = summary.pop('user_latencies')
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    print(json.dumps({
+        'users': summary['users'],
+        'failed': summary['failed'],
+        'scrape_time': summary['scrape_time'],
+        'users_per_sec': summary['users'] / summary['scrape_time'] if summary['scrape_time'] else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'peak_rss_mib': peak_rss / 2 ** 20,
+        'db_write_time': summary['writer']['write_time'],
+        'rows_written': summary['writer']['rows_written'],
+        'batches': summary['writer']['batches']
+    }))
+
+
+def bench(size: int, base_config: Dict[str, Any], base_url: str, browser: bool, concurrency: int) -> Dict[str, Any]:
+    """Run one roster size in a fresh process (so peak RSS is its own) and temp directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.yaml"
+        config = bench_config(base_config, base_url, size, Path(tmp) / "bench.sqlite", browser, concurrency)
+        config_path.write_text(yaml.safe_dump(config))
+
+        # The run's own log goes to the temp directory; stdout carries the summary
+        process = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', str(config_path)],
+                                 cwd=tmp, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"Benchmark run for {size} users failed (exit code {process.returncode})")
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', default='10,100,1000',
+                        help="Comma-separated roster sizes (e.g. 10,100,1000,10000)")
+    parser.add_argument('--concurrency', type=int, help="Profiles scraped at once (default: from config.yaml)")
+    parser.add_argument('--browser', action='store_true',
+                        help="Scrape the stub's profile pages with the browser instead of the HTTP fast path")
+    parser.add_argument('--json', metavar='PATH', help="Also write the results to this file")
+    parser.add_argument('--child', metavar='CONFIG', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    logger = setup_logger()
+    base_config = load_config(str(ROOT / "config.yaml"))
+    sizes = [int(size) for size in args.users.split(',')]
+
+    server, base_url = start_stub_server()
+    logger.start(f"Benchmarking full runs against the stub at {base_url} "
+                 f"({'browser' if args.browser else 'HTTP fast path'})...")
+    results = []
+    try:
+        for size in sizes:
+            result = bench(size, base_config, base_url, args.browser, args.concurrency)
+            results.append(result)
+            logger.success(f"{size} users: {result['users_per_sec']:.1f} users/s")
+    finally:
+        server.shutdown()
+
+    logger.blank()
+    logger.blank(f"{'users':>7}  {'users/s':>9}  {'p50 ms':>8}  {'p95 ms':>8}  {'peak RSS':>10}  {'DB write':>9}  {'rows':>7}")
+    for result in results:
+        logger.blank(
+            f"{result['users']:>7}  {result['users_per_sec']:>9.1f}  {result['p50_ms']:>8.1f}  {result['p95_ms']:>8.1f}  "
+            f"{result['peak_rss_mib']:>7.1f} MiB  {result['db_write_time']:>8.2f}s  {result['rows_written']:>7}"
+        )
+    logger.blank()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        logger.info(f"Results written to {args.json}")
+    logger.complete("Benchmark finished")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Check the materialized leaderboard against a full recomputation"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
+from src.utils.logger import setup_logger
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repair', action='store_true', help="Rebuild the leaderboard if it is inconsistent")
+    args = parser.parse_args()
+    
+    logger = setup_logger()
+    
+    db = DatabaseManager.from_config(load_config().get('database') or {})
+    mismatches = db.check_leaderboard()
+    
+    if not mismatches:
+        logger.success("Leaderboard matches the submissions")
+        db.close()
+        return
+    
+    logger.warning(f"{len(mismatches)} leaderboard rows differ from the recomputation:")
+    for row in mismatches[:20]:
+        logger.blank(
+            f"  competition {row['competition_id']}, {row['username']}: "
+            f"score {row['actual_score']} (expected {row['expected_score']}), "
+            f"solved {row['actual_solved']} (expected {row['expected_solved']})"
+        )
+    if len(mismatches) > 20:
+        logger.blank(f"  ... and {len(mismatches) - 20} more")
+    
+    if not args.repair:
+        logger.info("Run with --repair to rebuild it")
+        db.close()
+        sys.exit(1)
+    
+    db.rebuild_leaderboard()
+    logger.success("Leaderboard rebuilt")
+    db.close()
+
+if __name__ == "__main__":
+    main()
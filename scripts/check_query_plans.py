@@ -0,0 +1,124 @@
+"""Check that the hot queries use indexes instead of full table scans"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import tempfile
+from pathlib import Path
+from typing import List, Callable, Set, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.utils.logger import setup_logger
+
+# A plan line like "SCAN s" (no index) is a full table scan, unless `s` is a
+# subquery SQLite materialized itself (the scan then reads a temporary result)
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+MATERIALIZED = re.compile(r'^MATERIALIZE (\w+)$')
+
+# The problem catalog is loaded whole (and cached) by design
+ALLOWED_SCANS = {'problems'}
+
+
+def populate(db: DatabaseManager, competitions: int = 3, users: int = 200, problems: int = 10):
+    """Fill the database with enough rows for the planner to prefer indexes"""
+    db.init_problems([
+        {'slug': f"problem-{p}", 'title': f"Problem {p}", 'difficulty': 'Easy', 'points': p % 3 + 1}
+        for p in range(problems)
+    ])
+    for c in range(competitions):
+        comp_id = db.create_competition(f"Comp {c}", "2026-01-01", "2026-01-08")
+        db.start_run_journal(comp_id, [f"user{u}" for u in range(users)])
+        db.save_results([
+            {
+                'username': f"user{u}",
+                'submissions': {
+                    f"problem-{p}": {'solved': (u + p + c) % 3 == 0} for p in range(problems)
+                },
+                'last_submission_id': u
+            }
+            for u in range(users)
+        ], comp_id)
+        db.mark_competition_run(comp_id)
+
+
+def hot_paths(db: DatabaseManager) -> List[Tuple[str, Callable[[], object], Set[str]]]:
+    """The queries to check: (name, call, tables allowed to be scanned)"""
+    comp_id = db.get_current_competition()['id']
+    return [
+        ('get_current_competition', db.get_current_competition, set()),
+        ('get_active_competitions', db.get_active_competitions, set()),
+        ('get_leaderboard_data', lambda: db.get_leaderboard_data(comp_id), set()),
+        ('get_all_time_leaderboard', db.get_all_time_leaderboard, set()),
+        ('get_user_submissions', lambda: db.get_user_submissions('user7', comp_id), set()),
+        ('get_all_submissions', lambda: db.get_all_submissions(comp_id), set()),
+        ('refresh_user_stats', lambda: db.refresh_user_stats(['user7', 'user8']), set()),
+        ('refresh_user_stats (competition)', lambda: db.refresh_user_stats(['user7', 'user8'], comp_id), set()),
+        ('get_last_submission_ids', lambda: db.get_last_submission_ids(comp_id), set()),
+        ('start_run_journal (resume)', lambda: db.start_run_journal(comp_id, ['user7', 'user8'], resume=True), set()),
+        ('get_run_journal', lambda: db.get_run_journal(comp_id), set()),
+        ('claim_users', lambda: db.claim_users([comp_id], 'plan-check', 25, 60), set()),
+        ('count_pending', lambda: db.count_pending([comp_id]), set()),
+        ('db_info: competition submissions',
+         lambda: db.cursor.execute("SELECT COUNT(*) FROM submissions WHERE competition_id = ?", (comp_id,)), set()),
+        ('db_info: competition solved',
+         lambda: db.cursor.execute("SELECT COUNT(*) FROM submissions WHERE solved = 1 AND competition_id = ?", (comp_id,)), set()),
+    ]
+
+
+def check(db: DatabaseManager, logger) -> int:
+    """Run every hot path, EXPLAIN the statements it issued, and report full scans"""
+    failures = 0
+    for name, call, allowed_scans in hot_paths(db):
+        # Start cold so cached lookups issue their queries too
+        db._invalidate_cache()
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            db.conn.set_trace_callback(None)
+
+        queries = [s for s in statements if s.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH')]
+        plan = [line for query in queries for line in db.explain_query_plan(query)]
+        materialized = {m.group(1) for m in map(MATERIALIZED.match, plan) if m}
+        scans = [m.group(1) for m in map(FULL_SCAN.match, plan)
+                 if m and m.group(1) not in allowed_scans | materialized | ALLOWED_SCANS]
+
+        if scans:
+            failures += 1
+            logger.error_msg(f"{name}: full scan of {', '.join(scans)}")
+            for line in plan:
+                logger.blank(f"    {line}")
+        else:
+            logger.success(f"{name}: {'; '.join(plan)}")
+    return failures
+
+
+def main():
+    logger = setup_logger()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "plans.sqlite"))
+        populate(db)
+
+        logger.info("Query plans (no statistics):")
+        failures += check(db, logger)
+
+        db.cursor.execute("ANALYZE")
+        logger.blank()
+        logger.info("Query plans (after ANALYZE):")
+        failures += check(db, logger)
+        db.close()
+
+    logger.blank()
+    if failures:
+        logger.error_msg(f"{failures} hot queries fall back to a full table scan")
+        sys.exit(1)
+    logger.complete("All hot queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
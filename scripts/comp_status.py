@@ -5,12 +5,13 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
 
 def main():
     logger = setup_logger()
     
-    db = DatabaseManager()
+    db = DatabaseManager.from_config(load_config().get('database') or {})
     
     # Get current competition
     comp = db.get_current_competition()
@@ -40,8 +41,17 @@ def main():
     logger.blank(f"  Users: {user_count}")
     logger.blank()
     
+    # Progress of the latest run, if one was started
+    journal = db.get_run_journal(comp['id'])
+    unfinished = journal['pending'] + journal['failed']
+    if journal['saved'] or unfinished:
+        logger.blank(f"  Run journal: {journal['saved']} saved, {journal['pending']} pending, {journal['failed']} failed")
+        logger.blank()
+    
     if comp['has_run']:
         logger.info("Competition has been run. Use 'make revert-run' to allow re-running.")
+    elif unfinished:
+        logger.info("The last run did not finish. Run 'make resume' to scrape only the remaining users.")
     else:
         logger.info("Competition ready. Run 'make run' to start.")
     
@@ -5,12 +5,13 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
 
 def main():
     logger = setup_logger()
     
-    db = DatabaseManager()
+    db = DatabaseManager.from_config(load_config().get('database') or {})
     
     # Get current competition
     comp = db.get_current_competition()
@@ -0,0 +1,174 @@
+"""Local stub of the LeetCode endpoints the scraper uses (for offline testing)"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Tuple
+
+from src.utils.logger import setup_logger
+
+# Titles handed out to synthetic users (includes the default config problems)
+PROBLEM_TITLES = [
+    "Two Sum", "Add Two Numbers", "Median of Two Sorted Arrays",
+    "Longest Substring Without Repeating Characters", "Longest Palindromic Substring",
+    "Zigzag Conversion", "Reverse Integer", "String to Integer (atoi)",
+    "Palindrome Number", "Regular Expression Matching", "Container With Most Water",
+    "Integer to Roman", "Roman to Integer", "Longest Common Prefix", "3Sum",
+    "3Sum Closest", "Letter Combinations of a Phone Number", "4Sum",
+    "Remove Nth Node From End of List", "Valid Parentheses", "Merge Two Sorted Lists",
+    "Generate Parentheses", "Merge k Sorted Lists", "Swap Nodes in Pairs",
+    "Reverse Nodes in k-Group", "Remove Duplicates from Sorted Array",
+    "Search in Rotated Sorted Array", "Trapping Rain Water", "Jump Game", "Climbing Stairs",
+]
+
+
+def title_to_slug(title: str) -> str:
+    """Same conversion LeetCodeScraper uses"""
+    slug = re.sub(r'[^\w\s-]', '', title.lower())
+    slug = re.sub(r'[-\s]+', '-', slug)
+    return slug.strip('-')
+
+
+def synthetic_submissions(username: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Deterministic recent accepted submissions for a user, newest first"""
+    seed = int(hashlib.sha256(username.encode('utf-8')).hexdigest(), 16)
+    count = seed % 21
+    base_id = 1_000_000 + (seed % 1_000_000) * 100
+
+    submissions = []
+    for i in range(count):
+        title = PROBLEM_TITLES[(seed >> (i % 64)) % len(PROBLEM_TITLES)]
+        submissions.append({
+            'id': str(base_id + count - i),
+            'title': title,
+            'titleSlug': title_to_slug(title),
+            'timestamp': str(1_770_000_000 - i * 3600),
+        })
+    return submissions[:limit]
+
+
+PROFILE_LINK = """
+          <a class="flex h-[56px] items-center rounded px-4 bg-fill-4 dark:bg-dark-fill-4" href="/submissions/detail/{id}/">
+            <div class="flex flex-1 justify-between">
+              <div class="flex items-center"><span class="text-label-1 dark:text-dark-label-1 font-medium line-clamp-1" data-title="{title}">{title}</span></div>
+              <span class="text-label-3 dark:text-dark-label-3 hidden whitespace-nowrap lc-md:inline">{hours} hours ago</span>
+            </div>
+          </a>"""
+
+
+def profile_page(username: str) -> str:
+    """A profile page with the user's recent AC list, in the DOM shape the scraper reads"""
+    links = ''.join(
+        PROFILE_LINK.format(id=s['id'], title=html.escape(s['title']), hours=i + 1)
+        for i, s in enumerate(synthetic_submissions(username))
+    )
+    name = html.escape(username)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{name} - LeetCode Profile</title>
+</head>
+<body>
+  <div id="__next">
+    <main class="mx-auto flex w-full max-w-[1200px] gap-4 p-4">
+      <aside class="w-[300px]"><div class="text-label-1 text-base font-semibold">{name}</div></aside>
+      <section class="flex-1">
+        <div class="flex items-center gap-2"><span class="text-label-1 font-medium">Recent AC</span></div>
+        <div class="flex flex-col gap-2">{links}
+        </div>
+      </section>
+    </main>
+  </div>
+</body>
+</html>
+"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the GraphQL endpoint and profile pages (/u/<username>/) with synthetic data"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real site
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't stall on delayed ACKs
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        match = re.fullmatch(r'/u/([^/?#]+)/?', self.path.split('?', 1)[0])
+        if not match or match.group(1).startswith('missing'):
+            self._send(404, b'<html><body>Page Not Found</body></html>', 'text/html; charset=utf-8')
+            return
+        self._send(200, profile_page(match.group(1)).encode('utf-8'), 'text/html; charset=utf-8')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+
+        if self.path.rstrip('/') != '/graphql':
+            self._send(404, b'Not Found', 'text/plain')
+            return
+
+        variables = payload.get('variables') or {}
+        username = variables.get('username', '')
+        if username.startswith('missing'):
+            body = {'data': {'recentAcSubmissionList': None},
+                    'errors': [{'message': 'That user does not exist.'}]}
+        else:
+            body = {'data': {'recentAcSubmissionList': synthetic_submissions(username, variables.get('limit', 20))}}
+
+        self._send(200, json.dumps(body).encode('utf-8'), 'application/json')
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server in a background thread
+
+    Returns:
+        The server (call shutdown() when done) and its base URL
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    logger = setup_logger()
+    server, base_url = start_stub_server(args.host, args.port)
+    logger.start(f"LeetCode stub listening on {base_url}")
+    logger.info("Set scraping.http.base_url in config.yaml to this URL to scrape offline")
+    logger.info(f"Profile pages are served at {base_url}/u/<username>/ (scraping.profile_url)")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        logger.complete("Stub server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
 
 def main():
@@ -13,12 +14,15 @@ def main():
     
     logger.start("Resetting database...")
     
-    db = DatabaseManager()
+    db = DatabaseManager.from_config(load_config().get('database') or {})
     
     # Clear submissions
     db.cursor.execute("DELETE FROM submissions")
     logger.success("Cleared all submissions")
     
+    # Forget processed submission ids so the next run scrapes in full
+    db.clear_scrape_state()
+    
     # Reset user stats
     db.cursor.execute("UPDATE users SET total_score = 0, problems_solved = 0")
     logger.success("Reset user statistics")
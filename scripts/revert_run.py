@@ -5,12 +5,13 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
 
 def main():
     logger = setup_logger()
     
-    db = DatabaseManager()
+    db = DatabaseManager.from_config(load_config().get('database') or {})
     
     # Get current competition
     comp = db.get_current_competition()
@@ -30,7 +31,7 @@ def main():
     logger.blank()
     logger.info("This will:")
     logger.blank("  1. Clear all submissions from this run")
-    logger.blank("  2. Reset user statistics")
+    logger.blank("  2. Recompute user statistics from the remaining competitions")
     logger.blank("  3. Mark competition as not run")
     logger.blank()
     logger.warning("This will delete submission data!")
@@ -50,15 +51,13 @@ def main():
     count = db.cursor.rowcount
     logger.success(f"Cleared {count} submissions for this competition")
     
-    # Reset user stats (will be recalculated if other competitions exist)
-    db.cursor.execute("UPDATE users SET total_score = 0, problems_solved = 0")
-    logger.success("Reset user statistics")
-    
     # Mark as not run
     db.revert_competition_run(comp['id'])
     logger.success("Marked as not run")
     
-    db.conn.commit()
+    # Recompute user stats from the submissions that remain
+    updated = db.refresh_user_stats()
+    logger.success(f"Recomputed statistics for {updated} users")
     
     logger.blank()
     logger.complete("Competition reverted! You can now run 'make run' again")
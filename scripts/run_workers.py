@@ -0,0 +1,104 @@
+"""Run several `main.py --worker` processes against one database and report how they split the run"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import subprocess
+import time
+from pathlib import Path
+
+from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
+from src.utils.logger import setup_logger
+
+MAIN = Path(__file__).resolve().parent.parent / "main.py"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Start several workers on the current run (uses ./config.yaml)")
+    parser.add_argument('--workers', type=int, default=3, help="Worker processes to start")
+    parser.add_argument('--kill-after', type=float, metavar='SECONDS',
+                        help="Kill the first worker after this long, to check its leases are taken over")
+    parser.add_argument('main_args', nargs='*', help="Extra main.py options (after --), e.g. -- --no-cache")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logger = setup_logger()
+
+    config = load_config()
+    db = DatabaseManager.from_config(config.get('database') or {})
+    comps = db.get_active_competitions()
+    if not comps:
+        logger.warning("No competition left to run")
+        logger.info("Run 'make set-comp' (or 'make revert-run') first")
+        db.close()
+        return
+    competition_ids = [comp['id'] for comp in comps]
+
+    log_dir = Path("logs")
+    log_dir.mkdir(exist_ok=True)
+    logger.start(f"Starting {args.workers} workers on {', '.join(comp['name'] for comp in comps)}...")
+    start = time.perf_counter()
+    workers = []
+    for i in range(args.workers):
+        name = f"worker-{i + 1}"
+        log_file = open(log_dir / f"{name}.log", 'w')
+        process = subprocess.Popen([sys.executable, str(MAIN), '--worker', name, '--workers', str(args.workers),
+                                    *args.main_args],
+                                   stdout=log_file, stderr=subprocess.STDOUT)
+        workers.append((name, process, log_file))
+
+    if args.kill_after is not None:
+        time.sleep(args.kill_after)
+        name, process, _ = workers[0]
+        process.kill()
+        logger.warning(f"Killed {name}; its leases will be taken over once they expire")
+
+    for name, process, log_file in workers:
+        process.wait()
+        log_file.close()
+    elapsed = time.perf_counter() - start
+
+    logger.blank()
+    finalizers = []
+    for name, process, _ in workers:
+        logger.blank(f"  {name}: exit code {process.returncode} (log: logs/{name}.log)")
+        if "competitions marked as complete" in (log_dir / f"{name}.log").read_text(errors='replace'):
+            finalizers.append(name)
+    logger.blank()
+
+    # Which worker's lease each user was finished under
+    placeholders = ', '.join('?' * len(competition_ids))
+    db.cursor.execute(f'''
+        SELECT worker_id, state, COUNT(DISTINCT username) AS users
+        FROM run_journal
+        WHERE competition_id IN ({placeholders})
+        GROUP BY worker_id, state
+        ORDER BY worker_id, state
+    ''', competition_ids)
+    logger.info("Users per worker:")
+    for row in db.cursor.fetchall():
+        logger.blank(f"  {row['worker_id'] or '(unclaimed)'}: {row['users']} {row['state']}")
+    logger.blank()
+
+    pending = db.count_pending(competition_ids)
+    db.cursor.execute(f"SELECT COUNT(*) AS done FROM competitions WHERE id IN ({placeholders}) AND has_run = 1",
+                      competition_ids)
+    done = db.cursor.fetchone()['done']
+    mismatches = sum(len(db.check_leaderboard(competition_id)) for competition_id in competition_ids)
+    db.close()
+
+    logger.info(f"Finished in {elapsed:.1f}s: {pending} users pending, {done} of {len(comps)} competitions marked as run "
+                f"by {', '.join(finalizers) or 'no worker'}")
+    if pending or done != len(comps) or len(finalizers) != 1 or mismatches:
+        logger.error_msg(f"Run incomplete ({mismatches} leaderboard mismatches)")
+        sys.exit(1)
+    logger.complete("All users processed and every competition finalized once")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,12 +17,15 @@ def main():
     config = load_config()
     comp_config = config['competition']
     
-    db = DatabaseManager()
+    db = DatabaseManager.from_config(config.get('database') or {})
     
     # Check if there's already a competition
     current_comp = db.get_current_competition()
     if current_comp:
         logger.warning(f"Existing competition found: '{current_comp['name']}'")
+        active = [comp['name'] for comp in db.get_active_competitions()]
+        if active:
+            logger.info(f"Competitions not run yet (scored together by the next run): {', '.join(active)}")
         logger.blank()
         response = input("Create new competition anyway? (y/N): ")
         if response.lower() != 'y':
@@ -31,16 +34,15 @@ def main():
             return
         logger.blank()
     
-    # Create new competition
+    # Initialize problems, then create the competition with them as its problem set
+    db.init_problems(config['problems'])
     comp_id = db.create_competition(
         name=comp_config['name'],
         start_date=comp_config['start_date'],
-        end_date=comp_config['end_date']
+        end_date=comp_config['end_date'],
+        problem_slugs=[p['slug'] for p in config['problems']]
     )
     
-    # Initialize problems
-    db.init_problems(config['problems'])
-    
     logger.success(f"Competition '{comp_config['name']}' created (ID: {comp_id})")
     logger.blank()
     logger.info("Competition details:")
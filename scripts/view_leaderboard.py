@@ -5,29 +5,42 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+
 from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--all-time', action='store_true', help="Show totals over every competition that has been run")
+    args = parser.parse_args()
+    
     logger = setup_logger()
     
-    db = DatabaseManager()
-    leaderboard = db.get_leaderboard_data()
+    db = DatabaseManager.from_config(load_config().get('database') or {})
+    leaderboard = db.get_all_time_leaderboard() if args.all_time else db.get_leaderboard_data()
     
     if not leaderboard:
         logger.info("No users in leaderboard yet")
         db.close()
         return
     
-    logger.info("Current Leaderboard:")
+    logger.info("All-Time Leaderboard:" if args.all_time else "Current Leaderboard:")
     logger.blank()
     
     for i, user in enumerate(leaderboard, 1):
-        logger.blank(f"  {i}. {user['username']}: {user['total_score']} points ({user['problems_solved']} solved)")
+        if args.all_time:
+            logger.blank(
+                f"  {i}. {user['username']}: {user['total_score']} points "
+                f"({user['easy_solved']} easy, {user['medium_solved']} medium, {user['hard_solved']} hard "
+                f"over {user['competitions']} competitions)"
+            )
+        else:
+            logger.blank(f"  {i}. {user['username']}: {user['total_score']} points ({user['problems_solved']} solved)")
     
     logger.blank()
     db.close()
 
 if __name__ == "__main__":
     main()
-
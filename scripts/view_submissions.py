@@ -5,28 +5,26 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database.db_manager import DatabaseManager
+from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
 
 def main():
     logger = setup_logger()
     
-    db = DatabaseManager()
-    submissions = db.get_all_submissions(all_competitions=True)
+    db = DatabaseManager.from_config(load_config().get('database') or {})
     
-    if not submissions:
-        logger.info("No submissions in database yet")
-        db.close()
-        return
-    
-    logger.info("All Submissions (All Competitions):")
-    logger.blank()
+    # Streamed from the cursor, so memory stays flat however long the history is
+    submissions = db.iter_all_submissions(all_competitions=True)
     
     current_comp = None
     current_user = None
     for sub in submissions:
         # Show competition header
         if sub['competition_id'] != current_comp:
-            if current_comp is not None:
+            if current_comp is None:
+                logger.info("All Submissions (All Competitions):")
+                logger.blank()
+            else:
                 logger.blank()
             current_comp = sub['competition_id']
             logger.info(f"Competition: {sub['competition_name']}")
@@ -40,7 +38,10 @@ def main():
         status = "✓" if sub['solved'] else "✗"
         logger.blank(f"    {status} {sub['problem_title']} ({sub['points']} points)")
     
-    logger.blank()
+    if current_comp is None:
+        logger.info("No submissions in database yet")
+    else:
+        logger.blank()
     db.close()
 
 if __name__ == "__main__":
@@ -1,40 +1,209 @@
 """Database manager for SQLite operations"""
 
+import base64
+import itertools
+import json
 import sqlite3
-from typing import List, Dict, Any, Optional
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Callable, Tuple
 from pathlib import Path
 from datetime import datetime
 
-from .models import Competition, User, Problem, Submission
+from .models import Competition, User, Problem, Submission, ScrapeState, LeaderboardEntry, CompetitionTotals, RunJournal, CompetitionProblem
+from .reader_pool import ReaderPool
+from .rows import make_row_factory, row_class
+from ..utils.metrics import metrics
 
 
 class DatabaseManager:
     """Manages SQLite database operations"""
     
-    def __init__(self, db_path: str = "db.sqlite"):
+    # Pragmas applied with WAL enabled (each can be overridden through `pragmas`)
+    WAL_PRAGMAS = {
+        'synchronous': 'NORMAL',    # fsync at checkpoints only; safe with WAL
+        'cache_size': -65536,       # 64 MiB page cache
+        'mmap_size': 268435456,     # 256 MiB memory-mapped I/O
+        'temp_store': 'MEMORY'
+    }
+    
+    # Full leaderboard recomputation: every user in every competition
+    LEADERBOARD_QUERY = '''
+        SELECT
+            c.id as competition_id,
+            u.username,
+            COALESCE(SUM(CASE WHEN s.solved THEN p.points ELSE 0 END), 0) as total_score,
+            COUNT(CASE WHEN s.solved THEN 1 END) as problems_solved
+        FROM competitions c
+        CROSS JOIN users u
+        LEFT JOIN submissions s ON u.username = s.username AND s.competition_id = c.id
+        LEFT JOIN problems p ON s.problem_slug = p.slug
+        GROUP BY c.id, u.username
+    '''
+    
+    # Sort keys encoded in keyset pagination cursors (leaderboard cursors also carry
+    # the rank of their row, so the next page carries on numbering from it)
+    LEADERBOARD_KEYS = ('total_score', 'problems_solved', 'username', 'rank')
+    USER_SUBMISSION_KEYS = ('updated_at', 'problem_slug')
+    SUBMISSION_KEYS = ('competition_id', 'username', 'updated_at', 'problem_slug')
+    
+    def __init__(self, db_path: str = "db.sqlite", wal: bool = False, pragmas: Dict[str, Any] = None,
+                 readers: int = 0, timeout: float = 5.0, row_type: str = 'dict'):
         """
         Initialize database manager
         
         Args:
             db_path: Path to SQLite database file (default: db.sqlite)
+            wal: Switch the database to WAL journaling and apply WAL_PRAGMAS
+            pragmas: Extra PRAGMA name -> value settings (override WAL_PRAGMAS)
+            readers: Size of the read-only connection pool used by queries (0 disables it)
+            timeout: Seconds to wait on a locked database before failing
+            row_type: 'dict' to return query results as dicts, 'compact' for CompactRow
+                      tuples (dict-style access, much less memory for large results)
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
+        self.row_type = row_type
+        self.conn = sqlite3.connect(db_path, timeout=timeout)
+        self.conn.row_factory = make_row_factory(row_type)
         self.cursor = self.conn.cursor()
+        
+        self.pragmas = {**(self.WAL_PRAGMAS if wal else {}), **(pragmas or {})}
+        if wal:
+            self.cursor.execute('PRAGMA journal_mode = WAL')
+        for name, value in self.pragmas.items():
+            self.cursor.execute(f"PRAGMA {name} = {value}")
+        
+        # Current competition and problem catalog, dropped whenever they may have changed
+        self._cache: Dict[str, Any] = {}
+        self._data_version = None
+        self.cache_version = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         self.init_database()
+        
+        self.reader_pool = None
+        if readers and db_path != ':memory:':
+            # Readers skip synchronous: it only matters for writes
+            reader_pragmas = {k: v for k, v in self.pragmas.items() if k != 'synchronous'}
+            self.reader_pool = ReaderPool(db_path, size=readers, pragmas=reader_pragmas, timeout=timeout,
+                                          row_type=row_type)
+    
+    @classmethod
+    def from_config(cls, database_config: Dict[str, Any]) -> 'DatabaseManager':
+        """
+        Build a database manager from the `database` section of config.yaml
+        
+        Args:
+            database_config: The `database` mapping (path, wal, readers, pragmas, timeout, row_type)
+        """
+        return cls(
+            db_path=database_config.get('path', 'db.sqlite'),
+            wal=database_config.get('wal', False),
+            pragmas=database_config.get('pragmas'),
+            readers=database_config.get('readers', 0),
+            timeout=database_config.get('timeout', 5.0),
+            row_type=database_config.get('row_type', 'dict')
+        )
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Cursor]:
+        """Dedicated cursor for read-only queries, from the reader pool when there is one"""
+        if self.reader_pool is None:
+            yield self.conn.cursor()
+            return
+        with self.reader_pool.connection() as conn:
+            yield conn.cursor()
+    
+    def _cached(self, key: str, load: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, loading it on a miss
+        
+        Entries are dropped when this manager changes the cached tables and when
+        PRAGMA data_version shows another connection committed.
+        """
+        data_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._invalidate_cache()
+        
+        if key in self._cache:
+            self.cache_hits += 1
+            return self._cache[key]
+        self.cache_misses += 1
+        value = self._cache[key] = load()
+        return value
+    
+    def _result(self, row) -> Dict[str, Any]:
+        """Convert a query row to the configured result type"""
+        return row if self.row_type == 'compact' else dict(row)
+    
+    def _invalidate_cache(self):
+        self._cache.clear()
+        self.cache_version += 1
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters of the competition and problem cache"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / total if total else 0.0,
+            'version': self.cache_version
+        }
+    
+    def _problem_catalog(self) -> Dict[str, Dict[str, Any]]:
+        """Problems by slug (cached)"""
+        def load():
+            self.cursor.execute('SELECT slug, title, difficulty, points FROM problems')
+            return {row['slug']: dict(row) for row in self.cursor.fetchall()}
+        return self._cached('problems', load)
     
     def init_database(self):
         """Create database tables if they don't exist using model schemas"""
         
         # Create tables in order (respect foreign key dependencies)
-        self.cursor.execute(Competition.SCHEMA)
-        self.cursor.execute(User.SCHEMA)
-        self.cursor.execute(Problem.SCHEMA)
-        self.cursor.execute(Submission.SCHEMA)
+        models = [Competition, User, Problem, Submission, ScrapeState, LeaderboardEntry, CompetitionTotals, RunJournal, CompetitionProblem]
+        for model in models:
+            self.cursor.execute(model.SCHEMA)
+        
+        # Managed indexes for the hot queries, then the triggers maintaining the leaderboard
+        for model in models:
+            for index in getattr(model, 'INDEXES', []):
+                self.cursor.execute(index)
+        for model in models:
+            for trigger in getattr(model, 'TRIGGERS', []):
+                self.cursor.execute(trigger)
+        
+        # Backfill the leaderboard of a database created before it existed
+        self.cursor.execute('SELECT EXISTS (SELECT 1 FROM leaderboard) AS filled')
+        if not self.cursor.fetchone()['filled']:
+            self.cursor.execute(f'INSERT INTO leaderboard (competition_id, username, total_score, problems_solved) {self.LEADERBOARD_QUERY}')
+        
+        # Roll up competitions that were run before the rollup table existed
+        self.cursor.execute('''
+            SELECT id FROM competitions
+            WHERE has_run = 1 AND id NOT IN (SELECT competition_id FROM competition_totals)
+        ''')
+        for row in self.cursor.fetchall():
+            self._write_competition_totals(row['id'])
         
         self.conn.commit()
     
+    def explain_query_plan(self, query: str, params: tuple = ()) -> List[str]:
+        """
+        Get SQLite's query plan for a statement
+        
+        Args:
+            query: SQL statement
+            params: Statement parameters
+            
+        Returns:
+            The plan's detail lines (e.g. "SEARCH s USING COVERING INDEX ...")
+        """
+        self.cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        return [row['detail'] for row in self.cursor.fetchall()]
+    
     def init_problems(self, problems: List[Dict[str, Any]]):
         """
         Initialize problems from configuration
@@ -42,13 +211,20 @@ class DatabaseManager:
         Args:
             problems: List of problem dictionaries with slug, title, difficulty, points
         """
+        # Upsert rather than replace so unchanged problems don't fire the leaderboard triggers
         for problem in problems:
             self.cursor.execute('''
-                INSERT OR REPLACE INTO problems (slug, title, difficulty, points)
+                INSERT INTO problems (slug, title, difficulty, points)
                 VALUES (?, ?, ?, ?)
+                ON CONFLICT (slug) DO UPDATE SET
+                    title = excluded.title,
+                    difficulty = excluded.difficulty,
+                    points = excluded.points
+                WHERE (title, difficulty, points) IS NOT (excluded.title, excluded.difficulty, excluded.points)
             ''', (problem['slug'], problem['title'], problem['difficulty'], problem['points']))
         
         self.conn.commit()
+        self._invalidate_cache()
     
     def save_submission(self, username: str, problem_slug: str, solved: bool, competition_id: int, solved_at: str = None):
         """
@@ -61,20 +237,369 @@ class DatabaseManager:
             competition_id: Competition ID
             solved_at: Timestamp when solved (ISO format string or None)
         """
-        # Ensure user exists
-        self.cursor.execute('''
+        self.save_submissions([{
+            'username': username,
+            'problem_slug': problem_slug,
+            'solved': solved,
+            'solved_at': solved_at
+        }], competition_id)
+    
+    def save_submissions(self, submissions: List[Dict[str, Any]], competition_id: int):
+        """
+        Save or update many submission records in one transaction
+        
+        Args:
+            submissions: Dicts with username, problem_slug, solved and optional solved_at
+            competition_id: Competition ID
+        """
+        try:
+            self._write_submissions(submissions, competition_id)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def save_results(self, results: List[Dict[str, Any]], competition_id: int) -> int:
+        """
+        Save a whole run's scrape results in one transaction
+        
+        Writes every user's submissions and their newest processed submission id with
+        `executemany`, committing once. Results with an error are skipped. Users in
+        the competition's run journal are marked saved (or failed, with the error) in
+        the same transaction, so the journal never claims more than was committed.
+
+        Args:
+            results: Scraper results (username, submissions, optional last_submission_id)
+            competition_id: Competition ID
+            
+        Returns:
+            Number of submission rows written
+        """
+        return self._save_results((competition_id, user_result) for user_result in results)
+    
+    def save_competition_results(self, results: List[Dict[str, Any]], competition_ids: List[int]) -> int:
+        """
+        Save results scored against several competitions in one transaction
+        
+        Like `save_results`, for results whose `competitions` maps each competition id
+        to that competition's result (submissions, last_submission_id). A result with
+        an error is recorded as failed in every one of `competition_ids`.
+        
+        Args:
+            results: Multi-competition scraper results
+            competition_ids: The competitions the results were scored against
+            
+        Returns:
+            Number of submission rows written
+        """
+        def pairs():
+            for user_result in results:
+                if 'error' in user_result:
+                    for competition_id in competition_ids:
+                        yield competition_id, user_result
+                else:
+                    for competition_id, comp_result in user_result['competitions'].items():
+                        yield competition_id, {'username': user_result['username'], **comp_result}
+        
+        return self._save_results(pairs())
+    
+    def _save_results(self, results: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """Write (competition_id, result) pairs, their scrape state and journal entries, committing once"""
+        submissions = []
+        scrape_state = []
+        journal = []
+        for competition_id, user_result in results:
+            username = user_result['username']
+            if 'error' in user_result:
+                journal.append(('failed', str(user_result['error']), competition_id, username))
+                continue
+            journal.append(('saved', None, competition_id, username))
+            for problem_slug, submission_data in user_result['submissions'].items():
+                submissions.append({
+                    'username': username,
+                    'problem_slug': problem_slug,
+                    'competition_id': competition_id,
+                    'solved': submission_data['solved'],
+                    'solved_at': submission_data.get('solved_at')
+                })
+            if user_result.get('last_submission_id') is not None:
+                scrape_state.append((username, competition_id, user_result['last_submission_id']))
+        
+        start = time.perf_counter()
+        try:
+            self._write_submissions(submissions)
+            self.cursor.executemany('''
+                INSERT OR REPLACE INTO scrape_state (username, competition_id, last_submission_id, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ''', scrape_state)
+            # Only users enrolled by start_run_journal are tracked
+            self.cursor.executemany('''
+                UPDATE run_journal
+                SET state = ?, error = ?, attempts = attempts + 1, lease_expires = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE competition_id = ? AND username = ?
+            ''', journal)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        metrics.observe('db_write_batch_seconds', time.perf_counter() - start)
+        metrics.inc('db_batches_total')
+        metrics.inc('db_rows_written_total', len(submissions))
+        return len(submissions)
+    
+    def _write_submissions(self, submissions: List[Dict[str, Any]], competition_id: int = None):
+        """Write submission rows (and their users) without committing, each to its own competition_id if it has one"""
+        # Ensure users exist
+        self.cursor.executemany('''
             INSERT OR IGNORE INTO users (username, total_score, problems_solved)
             VALUES (?, 0, 0)
-        ''', (username,))
+        ''', ((username,) for username in dict.fromkeys(s['username'] for s in submissions)))
         
-        # Save submission
-        self.cursor.execute('''
+        # Save submissions
+        self.cursor.executemany('''
             INSERT OR REPLACE INTO submissions (username, problem_slug, competition_id, solved, solved_at, updated_at)
             VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (username, problem_slug, competition_id, solved, solved_at))
+        ''', (
+            (s['username'], s['problem_slug'], s.get('competition_id', competition_id), s['solved'], s.get('solved_at'))
+            for s in submissions
+        ))
+    
+    def rebuild_leaderboard(self):
+        """Recompute the whole materialized leaderboard from submissions"""
+        try:
+            self.cursor.execute('DELETE FROM leaderboard')
+            self.cursor.execute(f'INSERT INTO leaderboard (competition_id, username, total_score, problems_solved) {self.LEADERBOARD_QUERY}')
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def check_leaderboard(self, competition_id: int = None) -> List[Dict[str, Any]]:
+        """
+        Compare the materialized leaderboard against a full recomputation
+        
+        Args:
+            competition_id: Competition ID (checks every competition if None)
+            
+        Returns:
+            One dict per mismatching row, with expected_* and actual_* values
+            (actual values are None for missing rows, expected values for stale ones)
+        """
+        query = f'''
+            WITH expected AS ({self.LEADERBOARD_QUERY}),
+            compared AS (
+                SELECT
+                    e.competition_id, e.username,
+                    e.total_score as expected_score, l.total_score as actual_score,
+                    e.problems_solved as expected_solved, l.problems_solved as actual_solved
+                FROM expected e
+                LEFT JOIN leaderboard l ON l.competition_id = e.competition_id AND l.username = e.username
+                UNION ALL
+                SELECT
+                    l.competition_id, l.username,
+                    NULL, l.total_score, NULL, l.problems_solved
+                FROM leaderboard l
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM expected e
+                    WHERE e.competition_id = l.competition_id AND e.username = l.username
+                )
+            )
+            SELECT * FROM compared
+            WHERE (expected_score IS NOT actual_score
+                   OR expected_solved IS NOT actual_solved)
+        '''
+        
+        params = []
+        if competition_id is not None:
+            query += ' AND competition_id = ?'
+            params.append(competition_id)
+        query += ' ORDER BY competition_id, username'
         
+        with self._reader() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        
+        return [self._result(row) for row in rows]
+    
+    def get_last_submission_ids(self, competition_id: int) -> Dict[str, int]:
+        """
+        Get the newest processed submission id of every user in a competition
+        
+        Args:
+            competition_id: Competition ID
+            
+        Returns:
+            Mapping of username to last processed submission id
+        """
+        self.cursor.execute('''
+            SELECT username, last_submission_id
+            FROM scrape_state
+            WHERE competition_id = ?
+        ''', (competition_id,))
+        return {row['username']: row['last_submission_id'] for row in self.cursor.fetchall()}
+    
+    def set_last_submission_id(self, username: str, competition_id: int, submission_id: int):
+        """
+        Record the newest submission processed for a user in a competition
+        
+        Args:
+            username: LeetCode username
+            competition_id: Competition ID
+            submission_id: Newest processed submission id
+        """
+        self.cursor.execute('''
+            INSERT OR REPLACE INTO scrape_state (username, competition_id, last_submission_id, updated_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (username, competition_id, submission_id))
         self.conn.commit()
     
+    def clear_scrape_state(self, competition_id: int = None):
+        """
+        Forget processed submission ids so the next run scrapes in full
+        
+        Args:
+            competition_id: Competition ID (clears every competition if None)
+        """
+        if competition_id is None:
+            self.cursor.execute('DELETE FROM scrape_state')
+        else:
+            self.cursor.execute('DELETE FROM scrape_state WHERE competition_id = ?', (competition_id,))
+        self.conn.commit()
+
+    def start_run_journal(self, competition_id: int, usernames: List[str], resume: bool = False) -> List[str]:
+        """
+        Record the users a run will scrape and return the ones still to do
+
+        A fresh run replaces the competition's journal with every user pending. A
+        resumed run keeps it: users already saved are skipped, users that failed or
+        were never saved (e.g. the run crashed first) are scraped again, and users
+        added to the roster since are enrolled as pending.
+
+        Args:
+            competition_id: Competition ID
+            usernames: The run's roster
+            resume: Continue the journal left by an unfinished run
+
+        Returns:
+            The users to scrape, in roster order
+        """
+        usernames = list(dict.fromkeys(usernames))
+        try:
+            if not resume:
+                self.cursor.execute('DELETE FROM run_journal WHERE competition_id = ?', (competition_id,))
+            self.cursor.executemany('''
+                INSERT OR IGNORE INTO run_journal (competition_id, username, state)
+                VALUES (?, ?, 'pending')
+            ''', ((competition_id, username) for username in usernames))
+            self.cursor.execute('''
+                SELECT username FROM run_journal
+                WHERE competition_id = ? AND state = 'saved'
+            ''', (competition_id,))
+            saved = {row['username'] for row in self.cursor.fetchall()}
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return [username for username in usernames if username not in saved]
+
+    def get_run_journal(self, competition_id: int) -> Dict[str, Any]:
+        """
+        Summarize a competition's run journal
+
+        Returns:
+            Counts per state ('pending', 'saved', 'failed'), the users saved so far
+            and each failed user's last error
+        """
+        self.cursor.execute('''
+            SELECT username, state, error FROM run_journal
+            WHERE competition_id = ?
+            ORDER BY username
+        ''', (competition_id,))
+        journal = {'pending': 0, 'saved': 0, 'failed': 0, 'saved_users': [], 'errors': {}}
+        for row in self.cursor.fetchall():
+            journal[row['state']] += 1
+            if row['state'] == 'saved':
+                journal['saved_users'].append(row['username'])
+            elif row['state'] == 'failed':
+                journal['errors'][row['username']] = row['error']
+        return journal
+
+    def claim_users(self, competition_ids: List[int], worker_id: str, limit: int, lease_seconds: float) -> List[str]:
+        """
+        Lease a chunk of pending users to a worker
+
+        Users are picked from the pending journal rows of `competition_ids` whose lease
+        is free or has expired (e.g. its worker crashed). The chunk is selected and
+        leased inside BEGIN IMMEDIATE, so concurrent workers never claim the same user.
+
+        Args:
+            competition_ids: Competitions of the run
+            worker_id: Name of the claiming worker
+            limit: Most users to claim
+            lease_seconds: How long the lease lasts before other workers may take it
+
+        Returns:
+            The claimed usernames (empty when nothing is left to claim)
+        """
+        placeholders = ', '.join('?' * len(competition_ids))
+        now = time.time()
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            self.cursor.execute(f'''
+                SELECT DISTINCT username FROM run_journal
+                WHERE competition_id IN ({placeholders}) AND state = 'pending'
+                  AND (lease_expires IS NULL OR lease_expires < ?)
+                ORDER BY username
+                LIMIT ?
+            ''', (*competition_ids, now, limit))
+            usernames = [row['username'] for row in self.cursor.fetchall()]
+            if usernames:
+                self.cursor.execute(f'''
+                    UPDATE run_journal
+                    SET worker_id = ?, lease_expires = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE competition_id IN ({placeholders}) AND state = 'pending'
+                      AND username IN ({', '.join('?' * len(usernames))})
+                ''', (worker_id, now + lease_seconds, *competition_ids, *usernames))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return usernames
+
+    def renew_leases(self, competition_ids: List[int], worker_id: str, lease_seconds: float) -> int:
+        """Extend the leases a worker still holds on pending users; returns the rows renewed"""
+        return self._set_leases(competition_ids, worker_id, time.time() + lease_seconds)
+
+    def release_leases(self, competition_ids: List[int], worker_id: str) -> int:
+        """Give up a worker's leases on pending users so others can claim them at once"""
+        return self._set_leases(competition_ids, worker_id, None)
+
+    def _set_leases(self, competition_ids: List[int], worker_id: str, lease_expires: Optional[float]) -> int:
+        try:
+            self.cursor.execute(f'''
+                UPDATE run_journal
+                SET lease_expires = ?
+                WHERE competition_id IN ({', '.join('?' * len(competition_ids))})
+                  AND state = 'pending' AND worker_id = ?
+            ''', (lease_expires, *competition_ids, worker_id))
+            updated = self.cursor.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return updated
+
+    def count_pending(self, competition_ids: List[int]) -> int:
+        """Count the users of a run not saved or failed yet, leased or not"""
+        self.cursor.execute(f'''
+            SELECT COUNT(DISTINCT username) AS pending FROM run_journal
+            WHERE competition_id IN ({', '.join('?' * len(competition_ids))}) AND state = 'pending'
+        ''', competition_ids)
+        return self.cursor.fetchone()['pending']
+
     def get_leaderboard_data(self, competition_id: int = None) -> List[Dict[str, Any]]:
         """
         Get leaderboard data with scores
@@ -83,31 +608,79 @@ class DatabaseManager:
             competition_id: Competition ID (uses current competition if None)
             
         Returns:
-            List of users with their scores and solved problems, sorted by score descending
+            List of users with their scores, solved problems and rank, sorted by score descending
+        """
+        with metrics.timer('leaderboard_query_seconds'):
+            return list(self.iter_leaderboard(competition_id))
+    
+    def iter_leaderboard(self, competition_id: int = None, after: str = None,
+                         limit: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream leaderboard rows in leaderboard order
+        
+        Args:
+            competition_id: Competition ID (uses current competition if None)
+            after: Cursor token from get_leaderboard_page; resume after that row
+            limit: Maximum number of rows
+            
+        Yields:
+            Users with their scores, solved problems and rank
         """
         if competition_id is None:
             comp = self.get_current_competition()
             if not comp:
-                return []
+                return
             competition_id = comp['id']
         
+        # Served from the materialized leaderboard in index order; a row's rank is its
+        # position in that order, counted on from the cursor's rank
         query = '''
             SELECT 
-                u.username,
-                COALESCE(SUM(CASE WHEN s.solved THEN p.points ELSE 0 END), 0) as total_score,
-                COUNT(CASE WHEN s.solved THEN 1 END) as problems_solved,
+                l.username,
+                l.total_score,
+                l.problems_solved,
+                ? + ROW_NUMBER() OVER (
+                    ORDER BY l.total_score DESC, l.problems_solved DESC, l.username ASC
+                ) as rank,
                 u.last_updated
-            FROM users u
-            LEFT JOIN submissions s ON u.username = s.username AND s.competition_id = ?
-            LEFT JOIN problems p ON s.problem_slug = p.slug
-            GROUP BY u.username
-            ORDER BY total_score DESC, problems_solved DESC, u.username ASC
+            FROM leaderboard l
+            JOIN users u ON u.username = l.username
+            WHERE l.competition_id = ?
         '''
+        params = [0, competition_id]
+        
+        if after is not None:
+            key = self.decode_cursor(after, self.LEADERBOARD_KEYS)
+            params[0] = key['rank']
+            query += '''
+              AND (l.total_score < ?
+                   OR (l.total_score = ? AND (l.problems_solved < ?
+                       OR (l.problems_solved = ? AND l.username > ?))))
+            '''
+            params += [key['total_score'], key['total_score'],
+                       key['problems_solved'], key['problems_solved'], key['username']]
         
-        self.cursor.execute(query, (competition_id,))
-        rows = self.cursor.fetchall()
+        query += ' ORDER BY l.total_score DESC, l.problems_solved DESC, l.username ASC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
         
-        return [dict(row) for row in rows]
+        with self._reader() as cursor:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield self._result(row)
+    
+    def get_leaderboard_page(self, competition_id: int = None, after: str = None,
+                             page_size: int = 50) -> Dict[str, Any]:
+        """
+        Get one page of the leaderboard
+        
+        Returns:
+            {'items': [...], 'next_cursor': token for the next page, or None on the last page}
+        """
+        with metrics.timer('leaderboard_query_seconds'):
+            return self._page(self.iter_leaderboard(competition_id, after, page_size + 1),
+                              self.LEADERBOARD_KEYS, page_size)
     
     def get_user_submissions(self, username: str, competition_id: int = None) -> List[Dict[str, Any]]:
         """
@@ -120,10 +693,26 @@ class DatabaseManager:
         Returns:
             List of user's submissions with problem details
         """
+        return list(self.iter_user_submissions(username, competition_id))
+    
+    def iter_user_submissions(self, username: str, competition_id: int = None, after: str = None,
+                              limit: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a user's submissions, most recently updated first
+        
+        Args:
+            username: LeetCode username
+            competition_id: Competition ID (uses current competition if None)
+            after: Cursor token from get_user_submissions_page; resume after that row
+            limit: Maximum number of rows
+            
+        Yields:
+            The user's submissions with problem details
+        """
         if competition_id is None:
             comp = self.get_current_competition()
             if not comp:
-                return []
+                return
             competition_id = comp['id']
         
         query = '''
@@ -131,22 +720,39 @@ class DatabaseManager:
                 s.username,
                 s.problem_slug,
                 s.competition_id,
-                p.title as problem_title,
-                p.difficulty,
-                p.points,
                 s.solved,
                 s.solved_at,
                 s.updated_at
             FROM submissions s
-            JOIN problems p ON s.problem_slug = p.slug
             WHERE s.username = ? AND s.competition_id = ?
-            ORDER BY s.updated_at DESC
         '''
+        params = [username, competition_id]
+        
+        if after is not None:
+            key = self.decode_cursor(after, self.USER_SUBMISSION_KEYS)
+            query += ' AND (s.updated_at < ? OR (s.updated_at = ? AND s.problem_slug > ?))'
+            params += [key['updated_at'], key['updated_at'], key['problem_slug']]
+        
+        query += ' ORDER BY s.updated_at DESC, s.problem_slug ASC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
         
-        self.cursor.execute(query, (username, competition_id))
-        rows = self.cursor.fetchall()
+        catalog = self._problem_catalog()
+        with self._reader() as cursor:
+            cursor.execute(query, params)
+            yield from self._with_problems(cursor, catalog)
+    
+    def get_user_submissions_page(self, username: str, competition_id: int = None, after: str = None,
+                                  page_size: int = 50) -> Dict[str, Any]:
+        """
+        Get one page of a user's submissions
         
-        return [dict(row) for row in rows]
+        Returns:
+            {'items': [...], 'next_cursor': token for the next page, or None on the last page}
+        """
+        return self._page(self.iter_user_submissions(username, competition_id, after, page_size + 1),
+                          self.USER_SUBMISSION_KEYS, page_size)
     
     def get_all_submissions(self, competition_id: int = None, all_competitions: bool = False) -> List[Dict[str, Any]]:
         """
@@ -159,39 +765,137 @@ class DatabaseManager:
         Returns:
             List of all submissions with problem details
         """
+        return list(self.iter_all_submissions(competition_id, all_competitions))
+    
+    def iter_all_submissions(self, competition_id: int = None, all_competitions: bool = False,
+                             after: str = None, limit: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream submissions across all users without loading them all into memory
+        
+        Rows come ordered by competition, username, most recently updated first.
+        
+        Args:
+            competition_id: Competition ID (uses current competition if None and all_competitions=False)
+            all_competitions: If True, stream submissions from all competitions
+            after: Cursor token from get_all_submissions_page; resume after that row
+            limit: Maximum number of rows
+            
+        Yields:
+            Submissions with problem details
+        """
         query = '''
             SELECT 
                 s.username,
                 s.problem_slug,
                 s.competition_id,
                 c.name as competition_name,
-                p.title as problem_title,
-                p.difficulty,
-                p.points,
                 s.solved,
                 s.solved_at,
                 s.updated_at
             FROM submissions s
-            JOIN problems p ON s.problem_slug = p.slug
             JOIN competitions c ON s.competition_id = c.id
         '''
         
+        conditions = []
         params = []
         if not all_competitions:
             if competition_id is None:
                 comp = self.get_current_competition()
                 if not comp:
-                    return []
+                    return
                 competition_id = comp['id']
-            query += ' WHERE s.competition_id = ?'
+            conditions.append('s.competition_id = ?')
             params.append(competition_id)
         
-        query += ' ORDER BY s.competition_id, s.username, s.updated_at DESC'
+        if after is not None:
+            key = self.decode_cursor(after, self.SUBMISSION_KEYS)
+            # The row-value bound lets SQLite seek straight to the cursor's user
+            conditions.append('(s.competition_id, s.username) >= (?, ?)')
+            conditions.append('''(s.competition_id > ?
+                   OR s.username > ?
+                   OR s.updated_at < ?
+                   OR (s.updated_at = ? AND s.problem_slug > ?))''')
+            params += [key['competition_id'], key['username'],
+                       key['competition_id'], key['username'],
+                       key['updated_at'], key['updated_at'], key['problem_slug']]
+        
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY s.competition_id, s.username, s.updated_at DESC, s.problem_slug'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        catalog = self._problem_catalog()
+        with self._reader() as cursor:
+            cursor.execute(query, params)
+            yield from self._with_problems(cursor, catalog)
+    
+    def get_all_submissions_page(self, competition_id: int = None, all_competitions: bool = False,
+                                 after: str = None, page_size: int = 100) -> Dict[str, Any]:
+        """
+        Get one page of submissions across all users
         
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
+        Returns:
+            {'items': [...], 'next_cursor': token for the next page, or None on the last page}
+        """
+        rows = self.iter_all_submissions(competition_id, all_competitions, after, page_size + 1)
+        return self._page(rows, self.SUBMISSION_KEYS, page_size)
+    
+    def _with_problems(self, rows: Iterable[sqlite3.Row], catalog: Dict[str, Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Add problem_title, difficulty and points from the catalog, dropping unknown problems"""
+        extra = ('problem_title', 'difficulty', 'points')
+        problems = {slug: (p['title'], p['difficulty'], p['points']) for slug, p in catalog.items()}
         
-        return [dict(row) for row in rows]
+        if self.row_type != 'compact':
+            for row in rows:
+                values = problems.get(row['problem_slug'])
+                if values is not None:
+                    yield {**dict(row), **dict(zip(extra, values))}
+            return
+        
+        extended = None
+        for row in rows:
+            values = problems.get(row['problem_slug'])
+            if values is None:
+                continue
+            if extended is None:
+                extended = row_class(row.keys() + extra)
+            yield tuple.__new__(extended, row + values)
+    
+    @classmethod
+    def _page(cls, rows: Iterator[Dict[str, Any]], keys: Tuple[str, ...], page_size: int) -> Dict[str, Any]:
+        """Take one page from rows fetched with page_size + 1, and the cursor for the next"""
+        items = list(itertools.islice(rows, page_size + 1))
+        rows.close()
+        has_more = len(items) > page_size
+        items = items[:page_size]
+        return {
+            'items': items,
+            'next_cursor': cls.encode_cursor(items[-1], keys) if has_more else None
+        }
+    
+    @staticmethod
+    def encode_cursor(row: Dict[str, Any], keys: Tuple[str, ...]) -> str:
+        """Build an opaque keyset cursor token from a row's sort key"""
+        key = json.dumps({name: row[name] for name in keys}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(token: str, keys: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Parse a keyset cursor token
+        
+        Raises:
+            ValueError: If the token is malformed or was made for a different query
+        """
+        try:
+            key = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        except (ValueError, UnicodeError) as e:
+            raise ValueError(f"Invalid cursor token: {token!r}") from e
+        if not isinstance(key, dict) or set(key) != set(keys):
+            raise ValueError(f"Cursor token does not match this query: {token!r}")
+        return key
     
     def update_user_stats(self, username: str):
         """
@@ -200,70 +904,244 @@ class DatabaseManager:
         Args:
             username: LeetCode username
         """
-        query = '''
+        self.refresh_user_stats([username])
+    
+    def refresh_user_stats(self, usernames: List[str] = None, competition_id: int = None) -> int:
+        """
+        Recompute cached user statistics in one set-based UPDATE and one commit
+        
+        Args:
+            usernames: Users to refresh (every user if None)
+            competition_id: Count only this competition (all-time totals if None)
+            
+        Returns:
+            Number of users updated
+        """
+        if usernames is not None and not usernames:
+            return 0
+        
+        params = []
+        competition_filter = ''
+        if competition_id is not None:
+            competition_filter = 'AND s.competition_id = ?'
+            params.append(competition_id)
+        
+        user_filter = ''
+        if usernames is not None:
+            user_filter = f"WHERE username IN ({', '.join('?' * len(usernames))})"
+            params.extend(usernames)
+        
+        # A correlated subquery rather than UPDATE ... FROM, which needs SQLite 3.33
+        query = f'''
             UPDATE users
-            SET 
-                total_score = (
-                    SELECT COALESCE(SUM(p.points), 0)
-                    FROM submissions s
-                    JOIN problems p ON s.problem_slug = p.slug
-                    WHERE s.username = ? AND s.solved = 1
-                ),
-                problems_solved = (
-                    SELECT COUNT(*)
+            SET
+                (total_score, problems_solved) = (
+                    SELECT COALESCE(SUM(p.points), 0), COUNT(s.problem_slug)
                     FROM submissions s
-                    WHERE s.username = ? AND s.solved = 1
+                    LEFT JOIN problems p ON s.problem_slug = p.slug
+                    WHERE s.username = users.username AND s.solved = 1 {competition_filter}
                 ),
                 last_updated = CURRENT_TIMESTAMP
-            WHERE username = ?
+            {user_filter}
         '''
         
-        self.cursor.execute(query, (username, username, username))
-        self.conn.commit()
+        try:
+            self.cursor.execute(query, params)
+            updated = self.cursor.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return updated
     
-    def create_competition(self, name: str, start_date: str, end_date: str) -> int:
-        """Create a new competition"""
+    def create_competition(self, name: str, start_date: str, end_date: str,
+                           problem_slugs: List[str] = None) -> int:
+        """
+        Create a new competition
+
+        Args:
+            name: Competition name
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            problem_slugs: The competition's problem set (must already be in `problems`).
+                Without it the competition is scored against the config's problems
+                (see `get_active_competitions`).
+        """
 
         self.cursor.execute('''
             INSERT INTO competitions (name, start_date, end_date, has_run)
             VALUES (?, ?, ?, 0)
         ''', (name, start_date, end_date))
+        competition_id = self.cursor.lastrowid
+        self.cursor.executemany('''
+            INSERT OR IGNORE INTO competition_problems (competition_id, problem_slug)
+            VALUES (?, ?)
+        ''', ((competition_id, slug) for slug in problem_slugs or []))
         self.conn.commit()
-        return self.cursor.lastrowid
+        self._invalidate_cache()
+        return competition_id
     
     def get_current_competition(self) -> Optional[Dict[str, Any]]:
-        """Get the most recent competition"""
+        """Get the most recent competition (cached)"""
 
-        self.cursor.execute('''
-            SELECT id, name, start_date, end_date, has_run, created_at
-            FROM competitions
-            ORDER BY created_at DESC
-            LIMIT 1
-        ''')
-        row = self.cursor.fetchone()
-        return dict(row) if row else None
-    
-    def mark_competition_run(self, competition_id: int):
-        """Mark competition as run"""
+        def load():
+            self.cursor.execute('''
+                SELECT id, name, start_date, end_date, has_run, created_at
+                FROM competitions
+                ORDER BY created_at DESC
+                LIMIT 1
+            ''')
+            row = self.cursor.fetchone()
+            return dict(row) if row else None
+        
+        comp = self._cached('competition', load)
+        return dict(comp) if comp else None
+
+    def get_active_competitions(self, default_problem_slugs: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get every competition that has not been run yet, oldest first (cached)
+
+        Competitions created before problem sets were stored have none. Only the most
+        recent of them is still run, if it is the newest competition not run yet, and
+        it is scored against `default_problem_slugs` (the config's problems) as it was
+        before; older ones were superseded by "Create new competition anyway".
+
+        Args:
+            default_problem_slugs: Problem set of a competition created without one
 
+        Returns:
+            Competition dicts, each with the `problem_slugs` of its problem set
+        """
+
+        def load():
+            self.cursor.execute('''
+                SELECT id, name, start_date, end_date, has_run, created_at
+                FROM competitions
+                WHERE has_run = 0
+                ORDER BY created_at, id
+            ''')
+            competitions = [dict(row, problem_slugs=[]) for row in self.cursor.fetchall()]
+            by_id = {comp['id']: comp for comp in competitions}
+
+            self.cursor.execute('''
+                SELECT cp.competition_id, cp.problem_slug
+                FROM competitions c
+                JOIN competition_problems cp ON cp.competition_id = c.id
+                WHERE c.has_run = 0
+            ''')
+            for row in self.cursor.fetchall():
+                by_id[row['competition_id']]['problem_slugs'].append(row['problem_slug'])
+
+            return [comp for i, comp in enumerate(competitions)
+                    if comp['problem_slugs'] or i == len(competitions) - 1]
+
+        competitions = [dict(comp, problem_slugs=list(comp['problem_slugs']))
+                        for comp in self._cached('active_competitions', load)]
+        for comp in competitions:
+            if not comp['problem_slugs']:
+                comp['problem_slugs'] = list(default_problem_slugs or [])
+        return competitions
+
+    def mark_competition_run(self, competition_id: int) -> bool:
+        """
+        Mark competition as run and roll up its final results
+
+        Only the first call for a competition does anything, so workers racing to
+        finish the same run roll it up once.
+
+        Returns:
+            Whether this call marked the competition (False if it was already run)
+        """
+
+        try:
+            self.cursor.execute('''
+                UPDATE competitions
+                SET has_run = 1
+                WHERE id = ? AND has_run = 0
+            ''', (competition_id,))
+            marked = self.cursor.rowcount == 1
+            if marked:
+                self._write_competition_totals(competition_id)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self._invalidate_cache()
+        return marked
+    
+    def _write_competition_totals(self, competition_id: int):
+        """Snapshot a competition's leaderboard into competition_totals (without committing)"""
         self.cursor.execute('''
-            UPDATE competitions
-            SET has_run = 1
-            WHERE id = ?
+            INSERT OR REPLACE INTO competition_totals (
+                competition_id, username, total_score, problems_solved,
+                easy_solved, medium_solved, hard_solved, rank, finalized_at
+            )
+            SELECT
+                l.competition_id,
+                l.username,
+                l.total_score,
+                l.problems_solved,
+                COUNT(CASE WHEN p.difficulty = 'Easy' THEN 1 END),
+                COUNT(CASE WHEN p.difficulty = 'Medium' THEN 1 END),
+                COUNT(CASE WHEN p.difficulty = 'Hard' THEN 1 END),
+                ROW_NUMBER() OVER (ORDER BY l.total_score DESC, l.problems_solved DESC, l.username ASC),
+                CURRENT_TIMESTAMP
+            FROM leaderboard l
+            LEFT JOIN submissions s
+                ON s.username = l.username AND s.competition_id = l.competition_id AND s.solved = 1
+            LEFT JOIN problems p ON s.problem_slug = p.slug
+            WHERE l.competition_id = ?
+            GROUP BY l.username
         ''', (competition_id,))
-        self.conn.commit()
+    
+    def get_all_time_leaderboard(self) -> List[Dict[str, Any]]:
+        """
+        Get the all-time leaderboard over every competition that has been run
+        
+        Returns:
+            List of users with summed scores, solved counts by difficulty, the number of
+            competitions counted and their rank, sorted by score descending
+        """
+        query = '''
+            SELECT
+                username,
+                SUM(total_score) as total_score,
+                SUM(problems_solved) as problems_solved,
+                SUM(easy_solved) as easy_solved,
+                SUM(medium_solved) as medium_solved,
+                SUM(hard_solved) as hard_solved,
+                COUNT(*) as competitions,
+                ROW_NUMBER() OVER (
+                    ORDER BY SUM(total_score) DESC, SUM(problems_solved) DESC, username ASC
+                ) as rank
+            FROM competition_totals
+            GROUP BY username
+            ORDER BY rank
+        '''
+        
+        with metrics.timer('leaderboard_query_seconds'), self._reader() as cursor:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        
+        return [self._result(row) for row in rows]
     
     def revert_competition_run(self, competition_id: int):
-        """Mark competition as not run (allows re-running)"""
+        """Mark competition as not run (allows re-running from scratch)"""
         
         self.cursor.execute('''
             UPDATE competitions
             SET has_run = 0
             WHERE id = ?
         ''', (competition_id,))
+        self.cursor.execute('DELETE FROM scrape_state WHERE competition_id = ?', (competition_id,))
+        self.cursor.execute('DELETE FROM competition_totals WHERE competition_id = ?', (competition_id,))
+        self.cursor.execute('DELETE FROM run_journal WHERE competition_id = ?', (competition_id,))
         self.conn.commit()
+        self._invalidate_cache()
     
     def close(self):
         """Close database connection"""
+        if self.reader_pool:
+            self.reader_pool.close()
         self.conn.close()
 
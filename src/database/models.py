@@ -24,6 +24,13 @@ class Competition:
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     '''
+    
+    INDEXES: ClassVar[List[str]] = [
+        # get_current_competition: ORDER BY created_at DESC LIMIT 1
+        'CREATE INDEX IF NOT EXISTS idx_competitions_created_at ON competitions (created_at)',
+        # get_active_competitions: WHERE has_run = 0 (only the competitions not run yet)
+        'CREATE INDEX IF NOT EXISTS idx_competitions_active ON competitions (created_at) WHERE has_run = 0',
+    ]
 
 
 @dataclass
@@ -86,3 +93,258 @@ class Submission:
         )
     '''
 
+    INDEXES: ClassVar[List[str]] = [
+        # get_user_submissions / get_leaderboard_data: WHERE username = ? AND competition_id = ?
+        '''CREATE INDEX IF NOT EXISTS idx_submissions_user_competition
+           ON submissions (username, competition_id, solved, problem_slug)''',
+        # update_user_stats: WHERE username = ? AND solved = 1
+        '''CREATE INDEX IF NOT EXISTS idx_submissions_user_solved
+           ON submissions (username, solved, problem_slug)''',
+        # get_all_submissions and per-competition counts: WHERE competition_id = ? [AND solved = 1]
+        '''CREATE INDEX IF NOT EXISTS idx_submissions_competition_solved
+           ON submissions (competition_id, solved, username)''',
+        # iter_all_submissions: keyset pagination in (competition, user, newest first) order
+        '''CREATE INDEX IF NOT EXISTS idx_submissions_keyset
+           ON submissions (competition_id, username, updated_at DESC, problem_slug)''',
+    ]
+
+
+@dataclass
+class ScrapeState:
+    """Newest submission already processed for a user in a competition"""
+    username: str
+    competition_id: int
+    last_submission_id: int
+    updated_at: Optional[datetime] = None
+    
+    SCHEMA: ClassVar[str] = '''
+        CREATE TABLE IF NOT EXISTS scrape_state (
+            username TEXT NOT NULL,
+            competition_id INTEGER NOT NULL,
+            last_submission_id INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (username, competition_id),
+            FOREIGN KEY (username) REFERENCES users(username),
+            FOREIGN KEY (competition_id) REFERENCES competitions(id)
+        )
+    '''
+    
+    INDEXES: ClassVar[List[str]] = [
+        # get_last_submission_ids: WHERE competition_id = ?
+        '''CREATE INDEX IF NOT EXISTS idx_scrape_state_competition
+           ON scrape_state (competition_id, username, last_submission_id)''',
+    ]
+
+
+def _recompute_scores(where: str) -> str:
+    """Trigger statement recomputing the leaderboard rows matched by `where`"""
+    return f'''
+            UPDATE leaderboard
+            SET
+                total_score = (
+                    SELECT COALESCE(SUM(p.points), 0)
+                    FROM submissions s
+                    JOIN problems p ON s.problem_slug = p.slug
+                    WHERE s.username = leaderboard.username
+                      AND s.competition_id = leaderboard.competition_id
+                      AND s.solved = 1
+                ),
+                problems_solved = (
+                    SELECT COUNT(*)
+                    FROM submissions s
+                    WHERE s.username = leaderboard.username
+                      AND s.competition_id = leaderboard.competition_id
+                      AND s.solved = 1
+                )
+            WHERE {where};'''
+
+
+_USER_ROW = 'competition_id = {row}.competition_id AND username = {row}.username'
+_PROBLEM_ROWS = '''(competition_id, username) IN (
+                SELECT competition_id, username FROM submissions WHERE problem_slug = {row}.slug
+            )'''
+
+
+@dataclass
+class LeaderboardEntry:
+    """
+    Materialized leaderboard row: a user's score in one competition
+
+    Every user has a row in every competition. Triggers keep the scores in step with
+    submissions and problem points, so a write only touches the rows whose scores it
+    changes. Ranks are not stored: reads number the rows while scanning them in
+    idx_leaderboard_order (DatabaseManager.iter_leaderboard).
+    """
+    competition_id: int
+    username: str
+    total_score: int = 0
+    problems_solved: int = 0
+    
+    SCHEMA: ClassVar[str] = '''
+        CREATE TABLE IF NOT EXISTS leaderboard (
+            competition_id INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            total_score INTEGER NOT NULL DEFAULT 0,
+            problems_solved INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (competition_id, username),
+            FOREIGN KEY (competition_id) REFERENCES competitions(id),
+            FOREIGN KEY (username) REFERENCES users(username)
+        )
+    '''
+    
+    INDEXES: ClassVar[List[str]] = [
+        # get_leaderboard_data: WHERE competition_id = ? in leaderboard order (rank = position)
+        '''CREATE INDEX IF NOT EXISTS idx_leaderboard_order
+           ON leaderboard (competition_id, total_score DESC, problems_solved DESC, username)''',
+    ]
+    
+    TRIGGERS: ClassVar[List[str]] = [
+        # New users and competitions start with a zero row on every leaderboard
+        '''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_user_insert AFTER INSERT ON users BEGIN
+            INSERT OR IGNORE INTO leaderboard (competition_id, username)
+            SELECT id, NEW.username FROM competitions;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_competition_insert AFTER INSERT ON competitions BEGIN
+            INSERT OR IGNORE INTO leaderboard (competition_id, username)
+            SELECT NEW.id, username FROM users;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_user_delete AFTER DELETE ON users BEGIN
+            DELETE FROM leaderboard WHERE username = OLD.username;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_competition_delete AFTER DELETE ON competitions BEGIN
+            DELETE FROM leaderboard WHERE competition_id = OLD.id;
+        END''',
+        # Submission changes recompute that user's row (INSERT OR REPLACE fires the insert trigger)
+        f'''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_submission_insert AFTER INSERT ON submissions BEGIN
+            {_recompute_scores(_USER_ROW.format(row='NEW'))}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_submission_update AFTER UPDATE ON submissions BEGIN
+            {_recompute_scores(_USER_ROW.format(row='OLD'))}
+            {_recompute_scores(_USER_ROW.format(row='NEW'))}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_submission_delete AFTER DELETE ON submissions BEGIN
+            {_recompute_scores(_USER_ROW.format(row='OLD'))}
+        END''',
+        # Point changes recompute every row with a submission for the problem
+        f'''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_problem_insert AFTER INSERT ON problems BEGIN
+            {_recompute_scores(_PROBLEM_ROWS.format(row='NEW'))}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_problem_update AFTER UPDATE OF points ON problems
+        WHEN OLD.points IS NOT NEW.points BEGIN
+            {_recompute_scores(_PROBLEM_ROWS.format(row='NEW'))}
+        END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_leaderboard_problem_delete AFTER DELETE ON problems BEGIN
+            {_recompute_scores(_PROBLEM_ROWS.format(row='OLD'))}
+        END''',
+    ]
+
+
+@dataclass
+class CompetitionTotals:
+    """A user's final result in a competition, written when the competition is marked as run"""
+    competition_id: int
+    username: str
+    total_score: int = 0
+    problems_solved: int = 0
+    easy_solved: int = 0
+    medium_solved: int = 0
+    hard_solved: int = 0
+    rank: Optional[int] = None
+    finalized_at: Optional[datetime] = None
+    
+    SCHEMA: ClassVar[str] = '''
+        CREATE TABLE IF NOT EXISTS competition_totals (
+            competition_id INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            total_score INTEGER NOT NULL DEFAULT 0,
+            problems_solved INTEGER NOT NULL DEFAULT 0,
+            easy_solved INTEGER NOT NULL DEFAULT 0,
+            medium_solved INTEGER NOT NULL DEFAULT 0,
+            hard_solved INTEGER NOT NULL DEFAULT 0,
+            rank INTEGER,
+            finalized_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (competition_id, username),
+            FOREIGN KEY (competition_id) REFERENCES competitions(id),
+            FOREIGN KEY (username) REFERENCES users(username)
+        )
+    '''
+    
+    INDEXES: ClassVar[List[str]] = [
+        # get_all_time_leaderboard: GROUP BY username, read from the index alone
+        '''CREATE INDEX IF NOT EXISTS idx_competition_totals_user
+           ON competition_totals (username, total_score, problems_solved, easy_solved, medium_solved, hard_solved)''',
+    ]
+    
+    TRIGGERS: ClassVar[List[str]] = [
+        '''CREATE TRIGGER IF NOT EXISTS trg_competition_totals_competition_delete AFTER DELETE ON competitions BEGIN
+            DELETE FROM competition_totals WHERE competition_id = OLD.id;
+        END''',
+    ]
+
+
+@dataclass
+class RunJournal:
+    """
+    How far one user got in a competition's run: pending, saved or failed
+    
+    Pending users can be leased by a worker (`python main.py --worker`) until
+    lease_expires (unix time); an expired lease can be claimed by another worker.
+    """
+    competition_id: int
+    username: str
+    state: str = 'pending'
+    error: Optional[str] = None
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires: Optional[float] = None
+    updated_at: Optional[datetime] = None
+    
+    SCHEMA: ClassVar[str] = '''
+        CREATE TABLE IF NOT EXISTS run_journal (
+            competition_id INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending' CHECK (state IN ('pending', 'saved', 'failed')),
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker_id TEXT,
+            lease_expires REAL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (competition_id, username),
+            FOREIGN KEY (competition_id) REFERENCES competitions(id)
+        )
+    '''
+    
+    INDEXES: ClassVar[List[str]] = [
+        # claim_users: pending users whose lease is free or expired
+        """CREATE INDEX IF NOT EXISTS idx_run_journal_pending
+           ON run_journal (competition_id, lease_expires, username) WHERE state = 'pending'""",
+    ]
+    
+    TRIGGERS: ClassVar[List[str]] = [
+        '''CREATE TRIGGER IF NOT EXISTS trg_run_journal_competition_delete AFTER DELETE ON competitions BEGIN
+            DELETE FROM run_journal WHERE competition_id = OLD.id;
+        END''',
+    ]
+
+
+@dataclass
+class CompetitionProblem:
+    """Links a competition to a problem in its problem set"""
+    competition_id: int
+    problem_slug: str
+    
+    SCHEMA: ClassVar[str] = '''
+        CREATE TABLE IF NOT EXISTS competition_problems (
+            competition_id INTEGER NOT NULL,
+            problem_slug TEXT NOT NULL,
+            PRIMARY KEY (competition_id, problem_slug),
+            FOREIGN KEY (competition_id) REFERENCES competitions(id),
+            FOREIGN KEY (problem_slug) REFERENCES problems(slug)
+        )
+    '''
+    
+    TRIGGERS: ClassVar[List[str]] = [
+        '''CREATE TRIGGER IF NOT EXISTS trg_competition_problems_competition_delete AFTER DELETE ON competitions BEGIN
+            DELETE FROM competition_problems WHERE competition_id = OLD.id;
+        END''',
+    ]
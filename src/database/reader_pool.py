@@ -0,0 +1,82 @@
+"""Pool of read-only SQLite connections"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, List
+
+from .rows import make_row_factory
+
+
+class ReaderPool:
+    """
+    Small pool of read-only connections for concurrent leaderboard queries
+
+    In WAL mode readers never block the writer and the writer never blocks readers,
+    so queries served from the pool keep working while a scrape run is saving.
+    Connections are opened lazily, up to `size`, and may be used from any thread.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, pragmas: Dict[str, Any] = None, timeout: float = 5.0,
+                 row_type: str = 'dict'):
+        """
+        Initialize the pool
+
+        Args:
+            db_path: Path to the SQLite database file
+            size: Maximum number of open reader connections
+            pragmas: PRAGMA name -> value applied to every new connection
+            timeout: Seconds to wait for a lock (and for a free connection)
+            row_type: 'dict' for sqlite3.Row results, 'compact' for CompactRow
+        """
+        self.uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self.size = max(1, size)
+        self.pragmas = pragmas or {}
+        self.timeout = timeout
+        self.row_type = row_type
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = make_row_factory(self.row_type)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection for the duration of the block"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = len(self._all) < self.size
+                if can_open:
+                    conn = self._open()
+                    self._all.append(conn)
+            if not can_open:
+                conn = self._idle.get(timeout=self.timeout)
+
+        try:
+            yield conn
+        finally:
+            # End any implicit read transaction so the next borrower sees fresh data
+            conn.rollback()
+            self._idle.put(conn)
+
+    def close(self):
+        """Close every connection in the pool"""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
@@ -0,0 +1,90 @@
+"""Compact result rows built directly by the SQLite row factory"""
+
+import sqlite3
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Tuple
+
+
+class CompactRow(tuple):
+    """
+    Immutable result row stored as a plain tuple
+
+    Like sqlite3.Row it supports row['column'], row[index], keys() and dict(row),
+    and iterating yields values. It also offers attribute access (row.column), get()
+    and items(). Column names live on the class, so a row costs no more than a tuple.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self._fields, tuple.__iter__(self))
+
+    def __repr__(self) -> str:
+        return f"CompactRow({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+
+@lru_cache(maxsize=256)
+def row_class(fields: Tuple[str, ...]) -> type:
+    """The CompactRow subclass for a column list (one class per distinct query shape)"""
+    return type('CompactRow', (CompactRow,), {
+        '__slots__': (),
+        '_fields': fields,
+        '_index': {name: i for i, name in enumerate(fields)}
+    })
+
+
+def compact_row_factory() -> Any:
+    """
+    Build a row_factory returning CompactRow objects
+
+    The row class is looked up once per statement: the factory remembers the last
+    cursor description it saw, which SQLite reuses for every row of a query.
+    """
+    last_description = None
+    last_class = None
+
+    def factory(cursor: sqlite3.Cursor, row: tuple) -> CompactRow:
+        nonlocal last_description, last_class
+        description = cursor.description
+        if description is not last_description:
+            last_class = row_class(tuple(column[0] for column in description))
+            last_description = description
+        return tuple.__new__(last_class, row)
+
+    return factory
+
+
+ROW_TYPES = ('dict', 'compact')
+
+
+def make_row_factory(row_type: str) -> Any:
+    """Row factory for a connection: sqlite3.Row for 'dict' results, CompactRow for 'compact'"""
+    if row_type not in ROW_TYPES:
+        raise ValueError(f"Unknown row_type {row_type!r} (expected one of {', '.join(ROW_TYPES)})")
+    return compact_row_factory() if row_type == 'compact' else sqlite3.Row
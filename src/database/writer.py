@@ -0,0 +1,155 @@
+"""Background writer that saves scrape results while scraping continues"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional
+
+from .db_manager import DatabaseManager
+
+# Queue marker telling the writer to flush and stop
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Drains scrape results from a bounded asyncio.Queue and saves them in small batches
+
+    Writes run in a single-thread executor on the writer's own database connection
+    (opened in that thread), so the event loop keeps scraping while SQLite commits.
+    A full queue blocks `put`, which bounds memory and slows scraping down to the
+    speed of the database. The database must be a file: WAL mode lets the writer's
+    connection commit while other connections keep reading.
+    """
+
+    def __init__(self, connect: Callable[[], DatabaseManager], competition_ids: List[int],
+                 batch_size: int = 25, queue_size: int = 100, flush_interval: float = 0.5):
+        """
+        Initialize the writer
+
+        Args:
+            connect: Opens the writer's DatabaseManager (called in the writer thread)
+            competition_ids: Competitions the results were scored against
+            batch_size: Most results saved per transaction
+            queue_size: Most results waiting to be saved before `put` blocks
+            flush_interval: Seconds to wait for a batch to fill before saving it anyway
+        """
+        self.connect = connect
+        self.competition_ids = list(competition_ids)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.db: Optional[DatabaseManager] = None
+        self.task: Optional[asyncio.Task] = None
+        self.error: Optional[BaseException] = None
+
+        self.results_saved = 0
+        self.rows_written = 0
+        self.batches = 0
+        self.write_time = 0.0
+
+    @classmethod
+    def from_config(cls, database_config: Dict[str, Any], competition_ids: List[int]) -> 'BatchWriter':
+        """
+        Build a writer from the `database` section of config.yaml
+
+        Args:
+            database_config: The `database` mapping; batching options come from its `writer` key
+            competition_ids: Competitions the results were scored against
+        """
+        writer_config = database_config.get('writer') or {}
+        # The writer only writes: it doesn't need a reader pool of its own
+        connection_config = {**database_config, 'readers': 0}
+        return cls(
+            connect=lambda: DatabaseManager.from_config(connection_config),
+            competition_ids=competition_ids,
+            batch_size=writer_config.get('batch_size', 25),
+            queue_size=writer_config.get('queue_size', 100),
+            flush_interval=writer_config.get('flush_interval', 0.5)
+        )
+
+    async def start(self):
+        """Start draining the queue"""
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer')
+        self.task = asyncio.ensure_future(self._run())
+
+    async def put(self, result: Dict[str, Any]):
+        """Queue one user's result, waiting while the queue is full"""
+        if self.error is not None:
+            raise RuntimeError(f"Database writer failed: {self.error}") from self.error
+        await self.queue.put(result)
+
+    async def close(self):
+        """
+        Save everything still queued and stop
+
+        Raises:
+            The first error a batch write raised, if any
+        """
+        if self.task is not None:
+            await self.queue.put(_STOP)
+            await self.task
+            self.task = None
+        if self.executor is not None:
+            await asyncio.get_running_loop().run_in_executor(self.executor, self._close_db)
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.error is not None:
+            raise self.error
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self.queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+
+            # Give the batch a moment to fill, but never hold results back for long
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # After a failure keep draining (so producers never block) but stop writing
+            if self.error is None:
+                try:
+                    await loop.run_in_executor(self.executor, self._save, batch)
+                except Exception as e:
+                    self.error = e
+
+    def _save(self, batch: List[Dict[str, Any]]):
+        """Write one batch (runs in the writer thread)"""
+        if self.db is None:
+            self.db = self.connect()
+        start = time.perf_counter()
+        self.rows_written += self.db.save_competition_results(batch, self.competition_ids)
+        self.write_time += time.perf_counter() - start
+        self.results_saved += sum(1 for result in batch if 'error' not in result)
+        self.batches += 1
+
+    def _close_db(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get write counters"""
+        return {
+            'results_saved': self.results_saved,
+            'rows_written': self.rows_written,
+            'batches': self.batches,
+            'write_time': self.write_time
+        }
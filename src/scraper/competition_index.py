@@ -0,0 +1,92 @@
+"""Scores one profile fetch against several competitions' problem sets"""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class CompetitionIndex:
+    """
+    Maps problem slugs to the competitions whose problem set contains them
+
+    A user's recent submissions are walked once, and each one is fanned out only to
+    the competitions listing its slug, so scoring costs the same no matter how many
+    tracks run at once. Each competition keeps its own incremental cutoff (the newest
+    submission id already processed for the user in that competition).
+    """
+
+    def __init__(self, competitions: List[Dict[str, Any]]):
+        """
+        Build the index
+
+        Args:
+            competitions: Competition dicts with `id` and `problem_slugs`
+                (as returned by DatabaseManager.get_active_competitions)
+        """
+        self.problem_slugs: Dict[int, Tuple[str, ...]] = {
+            comp['id']: tuple(dict.fromkeys(comp['problem_slugs'])) for comp in competitions
+        }
+        slug_index: Dict[str, List[int]] = {}
+        for competition_id, slugs in self.problem_slugs.items():
+            for slug in slugs:
+                slug_index.setdefault(slug, []).append(competition_id)
+        self.slug_index: Dict[str, Tuple[int, ...]] = {slug: tuple(ids) for slug, ids in slug_index.items()}
+
+    @property
+    def competition_ids(self) -> List[int]:
+        return list(self.problem_slugs)
+
+    @property
+    def all_slugs(self) -> List[str]:
+        """Every slug in any competition's problem set"""
+        return list(self.slug_index)
+
+    @staticmethod
+    def _new_prefix(submissions: List[Dict[str, Any]], since_id: Optional[int]) -> Tuple[int, Optional[int]]:
+        """
+        Count the submissions newer than `since_id` and get the newest id among them
+
+        Submissions are ordered newest first and ids only grow, so the walk stops at
+        the first id that was already processed. Submissions without an id are kept.
+        """
+        if since_id is None:
+            count = len(submissions)
+        else:
+            count = next((i for i, s in enumerate(submissions)
+                          if s['id'] is not None and int(s['id']) <= since_id), len(submissions))
+        ids = [int(s['id']) for s in submissions[:count] if s['id'] is not None]
+        return count, max(ids) if ids else since_id
+
+    def score(self, submissions: List[Dict[str, Any]],
+              since_ids: Dict[int, Optional[int]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Score one user's recent submissions against every competition
+
+        Args:
+            submissions: Recent accepted submissions ({'id', 'slug'}), newest first
+            since_ids: Competition id -> newest submission id already processed for the
+                user there. Competitions without one get every problem (unsolved ones
+                included); the others only get problems solved by newer submissions.
+
+        Returns:
+            Competition id -> {'submissions': slug -> status, 'last_submission_id'}
+        """
+        prefixes: Dict[Optional[int], Tuple[int, Optional[int]]] = {}
+        results: Dict[int, Dict[str, Any]] = {}
+        cutoffs: Dict[int, int] = {}
+        for competition_id, slugs in self.problem_slugs.items():
+            since_id = since_ids.get(competition_id)
+            if since_id not in prefixes:
+                prefixes[since_id] = self._new_prefix(submissions, since_id)
+            cutoffs[competition_id], last_submission_id = prefixes[since_id]
+            results[competition_id] = {
+                'submissions': {} if since_id is not None else {
+                    slug: {'solved': False, 'problem_slug': slug} for slug in slugs
+                },
+                'last_submission_id': last_submission_id
+            }
+
+        for position, submission in enumerate(submissions):
+            slug = submission['slug']
+            for competition_id in self.slug_index.get(slug, ()):
+                if position < cutoffs[competition_id]:
+                    results[competition_id]['submissions'][slug] = {'solved': True, 'problem_slug': slug}
+        return results
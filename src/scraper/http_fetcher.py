@@ -0,0 +1,170 @@
+"""Lightweight HTTP fetcher for LeetCode's GraphQL API"""
+
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
+import asyncio
+import gzip
+import http.client
+import json
+import queue
+
+from .rate_limiter import ThrottledError
+
+
+class FetchError(Exception):
+    """Raised when the HTTP fetcher cannot return a user's submissions"""
+
+
+class LeetCodeHTTPFetcher:
+    """
+    Fetches recent accepted submissions over plain HTTP
+
+    Requests go to the same GraphQL endpoint the profile page uses, so no browser is
+    needed. Connections are kept alive and reused through a small pool, which lets
+    concurrent lookups share a handful of TCP/TLS sessions.
+    """
+
+    QUERY = '''
+        query recentAcSubmissions($username: String!, $limit: Int!) {
+            recentAcSubmissionList(username: $username, limit: $limit) {
+                id
+                title
+                titleSlug
+                timestamp
+            }
+        }
+    '''
+
+    def __init__(self, base_url: str = "https://leetcode.com", timeout: float = 30.0,
+                 pool_size: int = 4, limit: int = 20):
+        """
+        Initialize the fetcher
+
+        Args:
+            base_url: Scheme and host of the LeetCode site (or a local stub server)
+            timeout: Socket timeout in seconds
+            pool_size: Maximum number of idle keep-alive connections kept around
+            limit: Number of recent accepted submissions to request per user
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Invalid base URL: {base_url}")
+
+        self.base_url = base_url.rstrip('/')
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.limit = limit
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=max(1, pool_size))
+
+        self.requests = 0
+        self.connections_opened = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.connections_opened += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn: http.client.HTTPConnection):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, path: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Any:
+        """POST a JSON payload and return the decoded JSON response"""
+        body = json.dumps(payload).encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'Connection': 'keep-alive',
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            **headers
+        }
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            conn = self._acquire() if attempt == 0 else self._new_connection()
+            try:
+                self.requests += 1
+                conn.request('POST', path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise FetchError(f"Connection to {self.host} failed: {e}")
+            except TimeoutError as e:
+                conn.close()
+                raise ThrottledError(f"Request to {self.host} timed out: {e}")
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise FetchError(f"Request to {self.host} failed: {e}")
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            if response.status == 429 or response.status >= 500:
+                raise ThrottledError(f"HTTP {response.status} from {self.base_url}{path}", response.status)
+            if response.status != 200:
+                raise FetchError(f"HTTP {response.status} from {self.base_url}{path}")
+
+            if response.getheader('Content-Encoding') == 'gzip':
+                data = gzip.decompress(data)
+            try:
+                return json.loads(data)
+            except ValueError as e:
+                raise FetchError(f"Invalid JSON from {self.base_url}{path}: {e}")
+
+        raise FetchError(f"Request to {self.host} failed")
+
+    def fetch_recent_submissions(self, username: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get a user's recent accepted submissions, newest first (blocking)
+
+        Args:
+            username: LeetCode username
+            limit: Number of submissions to request (defaults to the fetcher's limit)
+
+        Returns:
+            Dicts with id, title, titleSlug and timestamp
+        """
+        result = self._post(
+            '/graphql/',
+            {
+                'operationName': 'recentAcSubmissions',
+                'query': self.QUERY,
+                'variables': {'username': username, 'limit': limit or self.limit}
+            },
+            {'Referer': f"{self.base_url}/u/{username}/"}
+        )
+
+        submissions = (result.get('data') or {}).get('recentAcSubmissionList')
+        if submissions is None:
+            errors = result.get('errors') or [{'message': 'missing recentAcSubmissionList'}]
+            raise FetchError(f"GraphQL error for '{username}': {errors[0].get('message')}")
+        return submissions
+
+    async def get_recent_submissions(self, username: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get a user's recent accepted submissions, newest first"""
+        return await asyncio.to_thread(self.fetch_recent_submissions, username, limit)
+
+    def close(self):
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
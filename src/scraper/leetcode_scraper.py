@@ -1,38 +1,195 @@
 """LeetCode scraper using Playwright"""
 
-from typing import List, Dict, Any, Optional
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, expect
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+from playwright.async_api import async_playwright, Browser, BrowserContext, Locator, Page, expect
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+import asyncio
 import re
+import time
+
+from .competition_index import CompetitionIndex
+from .http_fetcher import LeetCodeHTTPFetcher
+from .profile_cache import ProfileCache
+from .rate_limiter import AdaptiveRateLimiter, RetryPolicy, CircuitBreaker, ThrottledError
+from .resource_policy import ResourcePolicy
+from ..utils.metrics import metrics
 
 
 class LeetCodeScraper:
     """Scrapes LeetCode user profiles and submission data"""
     
-    def __init__(self, headless: bool = True, timeout: int = 30000):
-        """Initialize the scraper"""
+    # Reads the submission id (from the href) and the data-title of each link's first
+    # [data-title] descendant
+    EXTRACT_SUBMISSIONS_JS = """
+        links => links.map(link => {
+            const id = (link.getAttribute('href').match(/\\/submissions\\/detail\\/(\\d+)/) || [])[1] || null;
+            const title = link.querySelector('[data-title]');
+            return {id: id, title: title ? title.getAttribute('data-title') : null};
+        })
+    """
+    
+    DEFAULT_PROFILE_URL = "https://leetcode.com/u/{username}/"
+    
+    def __init__(self, headless: bool = True, timeout: int = 30000, concurrency: int = 1,
+                 profile_url: str = DEFAULT_PROFILE_URL,
+                 http_fetcher: Optional[LeetCodeHTTPFetcher] = None,
+                 resource_policy: Optional[ResourcePolicy] = None,
+                 profile_cache: Optional[ProfileCache] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize the scraper
+        
+        Args:
+            headless: Run the browser without a window
+            timeout: Default Playwright timeout in milliseconds
+            concurrency: Maximum number of profiles scraped at once (pages share one context)
+            profile_url: Profile page URL template with a {username} field
+            http_fetcher: Optional HTTP fast path tried before rendering the profile page
+            resource_policy: Optional request interception policy for the browser context
+            profile_cache: Optional on-disk cache consulted before fetching a profile
+            rate_limiter: Optional token bucket every profile request waits on
+            retry_policy: Optional per-user retry policy for failed fetches
+            circuit_breaker: Optional breaker that pauses scraping when failures spike
+        """
         self.headless = headless
         self.timeout = timeout
+        self.concurrency = max(1, int(concurrency))
+        self.profile_url = profile_url
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self._browser_lock = asyncio.Lock()
+        
+        self.http_fetcher = http_fetcher
+        self.http_fallbacks = 0
+        self.resource_policy = resource_policy
+        self.profile_cache = profile_cache
+        
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy(retries=0)
+        self.circuit_breaker = circuit_breaker
+        self.retries = 0
+        self.throttled = 0
+        
+        # Per-run memo of profile lookups (username -> task resolving to recent submissions),
+        # not to be confused with the on-disk `profile_cache`
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Seconds each user took from getting a scrape slot to having a result
+        self.user_latencies: List[float] = []
+    
+    @classmethod
+    def from_config(cls, scraping_config: Dict[str, Any]) -> 'LeetCodeScraper':
+        """
+        Build a scraper from the `scraping` section of config.yaml
+        
+        Args:
+            scraping_config: The `scraping` mapping (headless, timeout, concurrency, http, blocking)
+        """
+        http_config = scraping_config.get('http') or {}
+        http_fetcher = None
+        if http_config.get('enabled'):
+            http_fetcher = LeetCodeHTTPFetcher(
+                base_url=http_config.get('base_url', 'https://leetcode.com'),
+                timeout=scraping_config['timeout'] / 1000,
+                pool_size=http_config.get('pool_size', scraping_config.get('concurrency', 1)),
+                limit=http_config.get('limit', 20)
+            )
+        
+        blocking_config = scraping_config.get('blocking') or {}
+        resource_policy = None
+        if blocking_config.get('enabled'):
+            resource_policy = ResourcePolicy(
+                blocked_types=blocking_config.get('resource_types', ResourcePolicy.DEFAULT_BLOCKED_TYPES),
+                allow_hosts=blocking_config.get('allow_hosts'),
+                deny_hosts=blocking_config.get('deny_hosts'),
+                profile_url=scraping_config.get('profile_url', cls.DEFAULT_PROFILE_URL)
+            )
+        
+        cache_config = scraping_config.get('cache') or {}
+        profile_cache = None
+        if cache_config.get('enabled'):
+            profile_cache = ProfileCache(
+                cache_dir=cache_config.get('dir', 'cache/profiles'),
+                ttl=cache_config.get('ttl', 3600)
+            )
+        
+        rate_config = scraping_config.get('rate_limit')
+        retry_config = scraping_config.get('retry')
+        breaker_config = scraping_config.get('circuit_breaker')
+        
+        return cls(
+            headless=scraping_config['headless'],
+            timeout=scraping_config['timeout'],
+            concurrency=scraping_config.get('concurrency', 1),
+            profile_url=scraping_config.get('profile_url', cls.DEFAULT_PROFILE_URL),
+            http_fetcher=http_fetcher,
+            resource_policy=resource_policy,
+            profile_cache=profile_cache,
+            rate_limiter=AdaptiveRateLimiter(**rate_config) if rate_config else None,
+            retry_policy=RetryPolicy(**retry_config) if retry_config else None,
+            circuit_breaker=CircuitBreaker(**breaker_config) if breaker_config else None
+        )
     
     async def start(self):
+        """
+        Start the scraper
+        
+        With an HTTP fetcher configured the browser is only launched on the first
+        fallback, so runs where the fast path always succeeds never start Chromium.
+        """
+        with metrics.timer('scraper_start_seconds'):
+            if self.http_fetcher is None:
+                await self._ensure_browser()
+    
+    async def _ensure_browser(self):
+        """Launch the browser and context if they are not running yet"""
+        async with self._browser_lock:
+            if self.context is None:
+                await self._launch_browser()
+    
+    async def _launch_browser(self):
         """Start the browser"""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        )
-        self.context.set_default_timeout(self.timeout)
+        with metrics.timer('browser_launch_seconds'):
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self.context = await self.browser.new_context(
+                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            )
+            self.context.set_default_timeout(self.timeout)
+            if self.resource_policy:
+                await self.resource_policy.attach(self.context)
     
-    async def close(self):
-        """Close the browser"""
+    async def recycle_browser(self):
+        """
+        Shut the browser down to release its memory
+        
+        It is relaunched on the next profile that needs it. Callers must make sure no
+        page is in use.
+        """
+        async with self._browser_lock:
+            await self._close_browser()
+    
+    async def _close_browser(self):
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        self.context = None
+        self.browser = None
+        self.playwright = None
+    
+    async def close(self):
+        """Close the browser and any pooled HTTP connections"""
+        if self.http_fetcher:
+            self.http_fetcher.close()
+        await self._close_browser()
     
     def title_to_slug(self, title: str) -> str:
         """Convert problem title to slug format"""
@@ -40,41 +197,248 @@ class LeetCodeScraper:
         slug = re.sub(r'[-\s]+', '-', slug)
         return slug.strip('-')
     
+    def stats(self) -> Dict[str, Any]:
+        """Get counters describing the work this scraper has done"""
+        stats = {
+            'profiles_fetched': self.cache_misses,
+            'cache_hits': self.cache_hits,
+            'http_fallbacks': self.http_fallbacks,
+            'browser_started': self.context is not None
+        }
+        if self.resource_policy:
+            policy_stats = self.resource_policy.stats()
+            stats['blocked_requests'] = policy_stats['blocked_requests']
+            stats['allowed_requests'] = policy_stats['allowed_requests']
+            stats['transferred_bytes'] = policy_stats['transferred_bytes']
+        if self.profile_cache:
+            stats['disk_cache_hits'] = self.profile_cache.hits
+            stats['disk_cache_revalidated'] = self.profile_cache.revalidated
+            stats['disk_cache_misses'] = self.profile_cache.misses
+        stats['retries'] = self.retries
+        stats['throttled'] = self.throttled
+        if self.circuit_breaker:
+            stats['circuit_opens'] = self.circuit_breaker.opens
+        return stats
+    
+    def forget(self, username: str):
+        """Forget one user's memoized profile so the next lookup fetches again"""
+        self._inflight.pop(username, None)
+    
+    @staticmethod
+    def submissions_to_slugs(submissions: List[Dict[str, Any]]) -> List[str]:
+        """Reduce recent submissions to unique problem slugs, newest first"""
+        return list(dict.fromkeys(s['slug'] for s in submissions))
+    
+    async def get_user_recent_submissions(self, username: str) -> List[Dict[str, Any]]:
+        """
+        Get a user's recent accepted submissions as {'id', 'slug'} dicts, newest first
+        
+        Each profile is fetched at most once per run: later (or concurrent) lookups for
+        the same user share the first fetch. Failed fetches are not cached, so a later
+        lookup will try again.
+        """
+        task = self._inflight.get(username)
+        if task is not None:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            task = asyncio.ensure_future(self._fetch_recent_submissions(username))
+            self._inflight[username] = task
+        
+        try:
+            # Copy so callers can't mutate the cached list
+            return list(await asyncio.shield(task))
+        except Exception:
+            if self._inflight.get(username) is task:
+                del self._inflight[username]
+            raise
+    
+    def fetched_submissions(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the recent submissions of every profile fetched successfully so far
+        
+        Only completed lookups are read; nothing is fetched (or retried) again.
+        """
+        return {
+            username: list(task.result()) for username, task in self._inflight.items()
+            if task.done() and not task.cancelled() and task.exception() is None
+        }
+    
     async def get_user_recently_solved_problems(self, username: str) -> List[str]:
         """Get list of problem slugs that a user has recently solved"""
-        page = await self.context.new_page()
+        return self.submissions_to_slugs(await self.get_user_recent_submissions(username))
+    
+    async def _fetch_recent_submissions(self, username: str) -> List[Dict[str, Any]]:
+        """
+        Fetch recent submissions, consulting the on-disk cache first
         
-        try:
-            url = f"https://leetcode.com/u/{username}/"
-            await page.goto(url, wait_until='domcontentloaded')
-            submission_links = page.locator('a[href^="/submissions/detail/"]')
+        Fresh cache entries are returned directly. Stale entries are revalidated by
+        asking the HTTP API for just the newest submission; if it is unchanged the
+        cached submissions are reused, otherwise the profile is fetched in full.
+        """
+        cache = self.profile_cache
+        entry = cache.get(username) if cache else None
+        
+        if entry is not None:
+            if cache.is_fresh(entry):
+                cache.hits += 1
+                return entry['submissions']
+            
+            if self.http_fetcher and entry.get('newest_submission_id'):
+                try:
+                    await self._acquire()
+                    newest = await self.http_fetcher.get_recent_submissions(username, limit=1)
+                except Exception as e:
+                    # Fall through to a full fetch, which waits out any throttling
+                    self._record_outcome(e)
+                else:
+                    self._record_outcome()
+                    newest_id = newest[0]['id'] if newest else None
+                    if newest_id == entry['newest_submission_id']:
+                        cache.revalidated += 1
+                        return cache.touch(username, entry)['submissions']
+        
+        submissions, confirmed = await self._fetch_with_retry(username)
+        if cache:
+            cache.misses += 1
+            if confirmed:
+                cache.put(username, submissions)
+        return submissions
+    
+    async def _acquire(self):
+        """Wait for the circuit breaker to close and for a rate limiter token"""
+        if self.circuit_breaker:
+            await self.circuit_breaker.wait()
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+    
+    def _record_outcome(self, error: Optional[Exception] = None):
+        """
+        Feed one profile request's outcome to the rate limiter and circuit breaker
+        
+        Throttling (429, 5xx, timeouts) slows down the shared rate limiter, and every
+        outcome feeds the circuit breaker.
+        """
+        if error is None:
+            if self.rate_limiter:
+                self.rate_limiter.on_success()
+            if self.circuit_breaker:
+                self.circuit_breaker.record(True)
+            return
+        
+        if isinstance(error, ThrottledError):
+            self.throttled += 1
+            if self.rate_limiter:
+                self.rate_limiter.on_throttle()
+        if self.circuit_breaker:
+            self.circuit_breaker.record(False)
+    
+    async def _fetch_with_retry(self, username: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch a profile, retrying failures with jittered exponential backoff
+        
+        Every attempt's outcome is recorded (see `_record_outcome`). The last error is
+        raised once retries run out.
+        
+        Returns:
+            The submissions and whether they can be cached (see `_scrape_profile_page`)
+        """
+        attempt = 0
+        while True:
+            try:
+                submissions, confirmed = await self._fetch_profile(username)
+            except Exception as e:
+                metrics.inc('profile_errors_total')
+                self._record_outcome(e)
+                if attempt >= self.retry_policy.retries:
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+                self.retries += 1
+                continue
             
+            metrics.inc('profiles_fetched_total')
+            self._record_outcome()
+            return submissions, confirmed
+    
+    async def _fetch_profile(self, username: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch a profile, trying the HTTP fast path before the browser
+        
+        Throttling is raised straight away rather than retried in the browser, which
+        would hit the same servers.
+        
+        Returns:
+            The submissions and whether they can be cached (see `_scrape_profile_page`)
+        """
+        if self.http_fetcher:
             try:
-                await expect(submission_links.first).to_be_visible(timeout=10000)
+                await self._acquire()
+                with metrics.timer('profile_http_fetch_seconds'):
+                    submissions = await self.http_fetcher.get_recent_submissions(username)
+                return [{'id': s['id'], 'slug': s['titleSlug']} for s in submissions if s.get('titleSlug')], True
+            except ThrottledError:
+                raise
             except Exception:
-                return []
-            
-            count = await submission_links.count()
-            solved_problems = []
+                self.http_fallbacks += 1
+        
+        await self._acquire()
+        return await self._scrape_profile_page(username)
+    
+    async def _scrape_profile_page(self, username: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Load a user's profile page and extract recent submissions
+        
+        Returns:
+            The submissions and whether the page confirmed them. When no submission link
+            shows up in time the profile is taken as empty, but that may just be a slow
+            page, so the result must not be cached.
+        """
+        await self._ensure_browser()
+        page = await self.context.new_page()
+        
+        try:
+            url = self.profile_url.format(username=username)
+            with metrics.timer('profile_navigation_seconds'):
+                response = await page.goto(url, wait_until='domcontentloaded')
+            if response and (response.status == 429 or response.status >= 500):
+                raise ThrottledError(f"HTTP {response.status} loading profile of '{username}'", response.status)
+            submission_links = page.locator('a[href^="/submissions/detail/"]')
             
-            for i in range(count):
-                link = submission_links.nth(i)
-                title_elem = link.locator('[data-title]')
+            with metrics.timer('profile_extraction_seconds'):
+                try:
+                    await expect(submission_links.first).to_be_visible(timeout=10000)
+                except Exception:
+                    return [], False
                 
-                if await title_elem.count() > 0:
-                    title = await title_elem.get_attribute('data-title')
-                    if title:
-                        slug = self.title_to_slug(title)
-                        if slug not in solved_problems:
-                            solved_problems.append(slug)
-            
-            return solved_problems
+                return await self.extract_recent_submissions(submission_links), True
             
+        except ThrottledError:
+            raise
+        except PlaywrightTimeoutError as e:
+            raise ThrottledError(f"Timed out scraping user '{username}': {str(e)}")
         except Exception as e:
             raise Exception(f"Error scraping user '{username}': {str(e)}")
         finally:
             await page.close()
     
+    async def extract_recent_submissions(self, submission_links: Locator) -> List[Dict[str, Any]]:
+        """
+        Extract submission ids and problem slugs from submission links in a single round trip
+        
+        All links are read by one in-page evaluation instead of several Playwright
+        calls per link. Links without a title are skipped.
+        """
+        links = await submission_links.evaluate_all(self.EXTRACT_SUBMISSIONS_JS)
+        return [
+            {'id': link['id'], 'slug': self.title_to_slug(link['title'])}
+            for link in links if link['title']
+        ]
+    
+    async def extract_solved_problems(self, submission_links: Locator) -> List[str]:
+        """Extract unique problem slugs from submission links, newest first"""
+        return self.submissions_to_slugs(await self.extract_recent_submissions(submission_links))
+    
     async def check_problem_solved(self, username: str, problem_slug: str) -> bool:
         """Check if a specific problem is solved by a user"""
         try:
@@ -83,45 +447,78 @@ class LeetCodeScraper:
         except Exception as e:
             raise Exception(f"Error checking problem '{problem_slug}' for user '{username}': {str(e)}")
     
-    async def get_user_submissions(self, username: str, problem_slugs: List[str]) -> Dict[str, Any]:
-        """Get user's submission status for specific problems"""
-        submissions = {}
+    async def get_user_competition_results(self, username: str, index: CompetitionIndex,
+                                           since_ids: Optional[Dict[int, Dict[str, int]]] = None) -> Dict[str, Any]:
+        """
+        Score one profile fetch against every competition in `index`
         
+        Args:
+            username: LeetCode username
+            index: The competitions to score and their problem sets
+            since_ids: Competition id -> username -> newest submission id already
+                processed there. In such a competition only problems solved by newer
+                submissions are returned; problems with nothing new are left out.
+        
+        Returns:
+            Dict with username and competitions (competition id -> submissions and
+            last_submission_id), or username and error if the profile could not be read
+        """
+        since_ids = since_ids or {}
         try:
-            recently_solved = await self.get_user_recently_solved_problems(username)
-            for slug in problem_slugs:
-                submissions[slug] = {
-                    'solved': slug in recently_solved,
-                    'problem_slug': slug
-                }
-                
+            recent = await self.get_user_recent_submissions(username)
         except Exception as e:
-            for slug in problem_slugs:
-                submissions[slug] = {
-                    'solved': False,
-                    'problem_slug': slug,
-                    'error': str(e)
-                }
+            return {'username': username, 'error': str(e), 'submissions': {}}
         
-        return {
-            'username': username,
-            'submissions': submissions
-        }
+        user_since_ids = {competition_id: ids.get(username) for competition_id, ids in since_ids.items()}
+        return {'username': username, 'competitions': index.score(recent, user_since_ids)}
     
-    async def scrape_all_users(self, usernames: List[str], problem_slugs: List[str]) -> List[Dict[str, Any]]:
-        """Scrape submission data for all users"""
-        results = []
+    async def scrape_competitions(self, usernames: List[str], index: CompetitionIndex,
+                                  since_ids: Optional[Dict[int, Dict[str, int]]] = None,
+                                  on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape every user once and score them against several competitions
         
-        for username in usernames:
-            try:
-                user_data = await self.get_user_submissions(username, problem_slugs)
-                results.append(user_data)
-            except Exception as e:
-                results.append({
-                    'username': username,
-                    'error': str(e),
-                    'submissions': {}
-                })
+        Up to `concurrency` profiles are scraped at once, each in its own page of the
+        shared browser context. Results come from `get_user_competition_results`, in
+        the same order as `usernames`, and a failure for one user never affects the
+        others.
         
-        return results
-
+        With `on_result`, each result is awaited into it as soon as it is ready (in
+        completion order) instead of being collected, and an empty list is returned.
+        The scrape slot is held until `on_result` returns, so a slow consumer (e.g. a
+        full queue) slows scraping down rather than piling results up in memory.
+        If `on_result` raises, the scrapes still pending are cancelled and the error
+        is raised.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def scrape_one(username: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await self.get_user_competition_results(username, index, since_ids)
+                except Exception as e:
+                    result = {
+                        'username': username,
+                        'error': str(e),
+                        'submissions': {}
+                    }
+                latency = time.perf_counter() - start
+                self.user_latencies.append(latency)
+                metrics.observe('user_scrape_seconds', latency)
+                if on_result is None:
+                    return result
+                await on_result(result)
+                return None
+        
+        tasks = [asyncio.ensure_future(scrape_one(username)) for username in usernames]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # `on_result` failed (e.g. the database writer died): gather would leave the
+            # other scrapes running with nowhere to put their results, so stop them
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [result for result in results if result is not None]
@@ -0,0 +1,84 @@
+"""Persistent on-disk cache of extracted profile data"""
+
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+from urllib.parse import quote
+import json
+import os
+import time
+
+
+class ProfileCache:
+    """
+    Stores each user's last extracted recent submissions on disk
+
+    One JSON file per user holds the submissions ({'id', 'slug'} dicts, newest first),
+    the fetch time and, as validator, the id of the newest accepted submission when
+    known. Entries younger than the TTL are served as-is; older ones can be
+    revalidated by comparing the newest submission id, which is much cheaper than a
+    full fetch.
+    """
+
+    def __init__(self, cache_dir: str = "cache/profiles", ttl: float = 3600):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding one JSON file per user
+            ttl: Seconds an entry is served without revalidation
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _path(self, username: str) -> Path:
+        return self.cache_dir / f"{quote(username, safe='')}.json"
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """Get a user's cached entry, or None if there is no readable entry"""
+        try:
+            with open(self._path(username), 'r') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return entry if 'submissions' in entry else None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is still within the TTL"""
+        return time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def put(self, username: str, submissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store freshly fetched submissions"""
+        entry = {
+            'username': username,
+            'submissions': submissions,
+            'fetched_at': time.time(),
+            'newest_submission_id': submissions[0]['id'] if submissions else None
+        }
+
+        # Write then rename so a crash never leaves a half-written entry
+        path = self._path(username)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, path)
+        return entry
+
+    def touch(self, username: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Restart the TTL of an entry that was revalidated as unchanged"""
+        return self.put(username, entry['submissions'])
+
+    @staticmethod
+    def hit_rate(hits: int, revalidated: int, misses: int) -> float:
+        """
+        Fraction of lookups served without a full fetch
+
+        Takes the counters rather than reading this cache's own, so the totals of
+        several caches (e.g. one per sharding worker) can be rated too.
+        """
+        total = hits + revalidated + misses
+        return (hits + revalidated) / total if total else 0.0
@@ -0,0 +1,172 @@
+"""Rate limiting, retry and circuit breaking for scraping requests"""
+
+from typing import Optional, Dict, Any
+from collections import deque
+import asyncio
+import random
+import time
+
+
+def split_rate_limit(scraping_config: Dict[str, Any], parts: int) -> Dict[str, Any]:
+    """
+    Split the configured request rate evenly between scrapers sharing it
+
+    Args:
+        scraping_config: The `scraping` section of config.yaml
+        parts: Number of scrapers (processes) that will each apply the limit
+
+    Returns:
+        A copy of `scraping_config` whose rate_limit rates are divided by `parts`, so
+        together the scrapers stay within the configured limit
+    """
+    rate_config = scraping_config.get('rate_limit')
+    if not rate_config or parts <= 1:
+        return scraping_config
+
+    part_rate = dict(rate_config)
+    for key in ('rate', 'min_rate', 'max_rate'):
+        if part_rate.get(key):
+            part_rate[key] = part_rate[key] / parts
+    return {**scraping_config, 'rate_limit': part_rate}
+
+
+class ThrottledError(Exception):
+    """Raised when LeetCode throttles or fails a request (429, 5xx or timeout)"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every scraping task
+
+    The refill rate halves (down to `min_rate`) whenever a request is throttled and
+    creeps back up by `recovery` requests/second after each success, up to `max_rate`.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 5, min_rate: float = 0.5,
+                 max_rate: Optional[float] = None, backoff_factor: float = 0.5, recovery: float = 0.1):
+        """
+        Initialize the rate limiter
+
+        Args:
+            rate: Starting refill rate in requests per second
+            burst: Bucket size (requests allowed back to back)
+            min_rate: Lowest rate the limiter backs off to
+            max_rate: Highest rate it recovers to (defaults to the starting rate)
+            backoff_factor: Multiplier applied to the rate on each throttle
+            recovery: Requests/second added back after each success
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate
+        self.backoff_factor = backoff_factor
+        self.recovery = recovery
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        self.throttles = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        """Slowly raise the rate after a successful request"""
+        self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def on_throttle(self):
+        """Back off after a throttled request"""
+        self.throttles += 1
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+
+
+class RetryPolicy:
+    """Per-user retries with jittered exponential backoff"""
+
+    def __init__(self, retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Initialize the retry policy
+
+        Args:
+            retries: Retries after the first attempt
+            base_delay: Backoff ceiling for the first retry, in seconds
+            max_delay: Largest backoff ceiling, in seconds
+        """
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number `attempt` (0-based), with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Pauses all scraping when too many recent requests fail
+
+    Once at least `min_samples` of the last `window` requests have been recorded and
+    the failure rate reaches `failure_threshold`, the breaker opens: every task waits
+    `cooldown` seconds before sending anything else.
+    """
+
+    def __init__(self, window: int = 20, failure_threshold: float = 0.5,
+                 min_samples: int = 10, cooldown: float = 60.0):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            window: Number of recent outcomes considered
+            failure_threshold: Failure rate that opens the breaker
+            min_samples: Outcomes needed before the breaker can open
+            cooldown: Seconds the run pauses once the breaker opens
+        """
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self._outcomes: deque = deque(maxlen=window)
+        self._open_until = 0.0
+
+        self.opens = 0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def record(self, success: bool):
+        """Record the outcome of a request"""
+        self._outcomes.append(success)
+        if self.is_open() or len(self._outcomes) < self.min_samples:
+            return
+
+        failures = self._outcomes.count(False)
+        if failures / len(self._outcomes) >= self.failure_threshold:
+            self.opens += 1
+            self._open_until = time.monotonic() + self.cooldown
+            self._outcomes.clear()
+
+    async def wait(self):
+        """Wait for the breaker to close"""
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'opens': self.opens, 'open': self.is_open()}
@@ -0,0 +1,183 @@
+"""Multi-process browser sharding for large rosters"""
+
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+
+from .competition_index import CompetitionIndex
+from .leetcode_scraper import LeetCodeScraper
+from .rate_limiter import split_rate_limit
+from ..utils.metrics import metrics
+
+
+def _scrape_shard(scraping_config: Dict[str, Any], usernames: List[str], index: CompetitionIndex,
+                  since_ids: Dict[int, Dict[str, int]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]],
+                                                                 Dict[str, Any], List[float], Dict[str, Dict[str, Any]]]:
+    """
+    Scrape one shard of the roster in a worker process
+
+    Args:
+        scraping_config: The `scraping` section of config.yaml
+        usernames: The shard's users
+        index: The competitions to score and their problem sets
+        since_ids: Competition id -> username -> newest submission id already processed,
+            for the shard's users
+
+    Returns:
+        The shard's results, the recent submissions of every user fetched successfully,
+        the worker scraper's stats, its per-user latencies and a snapshot of the
+        metrics it recorded
+    """
+    # A pool process can run several shards; report only this one's metrics
+    metrics.reset()
+
+    async def run():
+        scraper = LeetCodeScraper.from_config(scraping_config)
+        try:
+            await scraper.start()
+            results = await scraper.scrape_competitions(usernames, index, since_ids)
+            return results, scraper.fetched_submissions(), scraper.stats(), scraper.user_latencies, metrics.snapshot()
+        finally:
+            await scraper.close()
+
+    return asyncio.run(run())
+
+
+class ShardedScraper:
+    """
+    Splits the roster across worker processes, each running its own browser
+
+    Exposes the same interface main.py uses on LeetCodeScraper. Workers are spawned
+    fresh (not forked) so each gets a clean Playwright instance and event loop.
+    """
+
+    def __init__(self, scraping_config: Dict[str, Any], workers: Optional[int] = None):
+        """
+        Initialize the sharded scraper
+
+        Args:
+            scraping_config: The `scraping` section of config.yaml, passed to every worker
+            workers: Number of worker processes (defaults to the number of CPU cores)
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # Split the configured request rate evenly so the pool stays within the limit
+        self.scraping_config = split_rate_limit(scraping_config, self.workers)
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+        self._recent: Dict[str, List[Dict[str, Any]]] = {}
+        self._worker_stats: List[Dict[str, Any]] = []
+        self.user_latencies: List[float] = []
+        self.cache_hits = 0
+
+    async def start(self):
+        """Start the worker pool"""
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    async def close(self):
+        """Shut down the worker pool"""
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def _split(self, usernames: List[str]) -> List[List[str]]:
+        """Split users into contiguous, evenly sized shards (one per worker)"""
+        shard_count = min(self.workers, len(usernames))
+        size, extra = divmod(len(usernames), shard_count)
+        shards, start = [], 0
+        for i in range(shard_count):
+            end = start + size + (1 if i < extra else 0)
+            shards.append(usernames[start:end])
+            start = end
+        return shards
+
+    async def scrape_competitions(self, usernames: List[str], index: CompetitionIndex,
+                                  since_ids: Optional[Dict[int, Dict[str, int]]] = None,
+                                  on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape every user once across the worker pool and score them against several
+        competitions (see LeetCodeScraper.scrape_competitions)
+
+        Results come back in the same order as `usernames`. If a whole worker fails
+        (e.g. its browser cannot start), every user in its shard gets an error entry.
+
+        With `on_result`, each result is awaited into it instead of being collected
+        (an empty list is returned). Workers report whole shards, so results arrive
+        shard by shard as workers finish. If `on_result` raises, shards that have not
+        started yet are cancelled and the error is raised.
+        """
+        if not usernames:
+            return []
+
+        since_ids = since_ids or {}
+        loop = asyncio.get_running_loop()
+        shards = self._split(list(usernames))
+
+        async def run_shard(shard: List[str]) -> List[Dict[str, Any]]:
+            shard_since_ids = {
+                competition_id: {username: ids[username] for username in shard if username in ids}
+                for competition_id, ids in since_ids.items()
+            }
+            try:
+                shard_results, recent, stats, latencies, shard_metrics = await loop.run_in_executor(
+                    self.executor, _scrape_shard, self.scraping_config, shard, index, shard_since_ids
+                )
+            except Exception as e:
+                return [{'username': username, 'error': str(e), 'submissions': {}} for username in shard]
+
+            self._recent.update(recent)
+            self._worker_stats.append(stats)
+            self.user_latencies.extend(latencies)
+            metrics.merge(shard_metrics)
+            return shard_results
+
+        if on_result is None:
+            return [result for shard_results in await asyncio.gather(*map(run_shard, shards))
+                    for result in shard_results]
+
+        tasks = [asyncio.ensure_future(run_shard(shard)) for shard in shards]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for result in await finished:
+                    await on_result(result)
+        except BaseException:
+            # `on_result` failed: don't start the shards still waiting for a worker
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return []
+
+    async def get_user_recent_submissions(self, username: str) -> List[Dict[str, Any]]:
+        """Get the recent submissions a worker fetched for this user"""
+        if username in self._recent:
+            self.cache_hits += 1
+            return list(self._recent[username])
+        raise Exception(f"No profile data for user '{username}' (not scraped or scrape failed)")
+
+    async def get_user_recently_solved_problems(self, username: str) -> List[str]:
+        """Get the recently solved slugs a worker fetched for this user"""
+        return LeetCodeScraper.submissions_to_slugs(await self.get_user_recent_submissions(username))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters summed across all workers"""
+        stats: Dict[str, Any] = {
+            'profiles_fetched': 0,
+            'cache_hits': self.cache_hits,
+            'http_fallbacks': 0,
+            'browser_started': False,
+            'workers': self.workers
+        }
+        for worker_stats in self._worker_stats:
+            for key, value in worker_stats.items():
+                if key == 'cache_hits':
+                    continue  # workers' own lookups, not the caller's
+                if isinstance(value, bool):
+                    stats[key] = stats.get(key, False) or value
+                elif isinstance(value, (int, float)):
+                    stats[key] = stats.get(key, 0) + value
+        return stats
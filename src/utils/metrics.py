@@ -0,0 +1,251 @@
+"""Per-stage run metrics: counters and latency histograms, exported as Prometheus text and JSON"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Sequence, Tuple, Union
+
+# Exported metric names get this prefix
+NAMESPACE = 'leetcode_bot'
+
+# Latency bucket upper bounds in seconds (plus an implicit +Inf bucket)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Help text for the metrics the bot records; other names can be recorded too
+DESCRIPTIONS = {
+    'scraper_start_seconds': "Time spent in LeetCodeScraper.start",
+    'browser_launch_seconds': "Time spent launching Chromium and its context",
+    'profile_http_fetch_seconds': "GraphQL requests for a profile's recent submissions",
+    'profile_navigation_seconds': "Browser navigations to a profile page",
+    'profile_extraction_seconds': "Waiting for and extracting submission links from a loaded profile page",
+    'user_scrape_seconds': "Whole per-user scrapes, retries included",
+    'db_write_batch_seconds': "Database transactions saving a batch of results",
+    'leaderboard_query_seconds': "Leaderboard reads",
+    'profiles_fetched_total': "Profiles fetched from LeetCode (HTTP or browser)",
+    'profile_errors_total': "Profile fetches that raised an error",
+    'db_batches_total': "Result batches saved",
+    'db_rows_written_total': "Submission rows written"
+}
+
+
+class Counter:
+    """A monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'type': self.kind, 'value': self.value}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        self.value += snapshot['value']
+
+
+class Histogram:
+    """
+    Observations counted into fixed buckets, as Prometheus histograms do
+
+    Memory stays constant however many values are observed; quantiles are estimated
+    by interpolating inside the bucket that holds them.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value) if self.count > 1 else value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            The estimate (0 with no observations), always between the smallest and
+            largest values observed
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.buckets):
+                    return self.max
+                lower = max(self.buckets[i - 1] if i else 0.0, self.min)
+                upper = min(self.buckets[i], self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'type': self.kind,
+            'buckets': list(self.buckets),
+            'counts': list(self.counts),
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95)
+        }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        if tuple(snapshot['buckets']) != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        if not snapshot['count']:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, snapshot['counts'])]
+        self.min = min(self.min, snapshot['min']) if self.count else snapshot['min']
+        self.count += snapshot['count']
+        self.sum += snapshot['sum']
+        self.max = max(self.max, snapshot['max'])
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms recorded during a run
+
+    Metrics are created on first use. Recording is thread-safe, so the database
+    writer thread and the event loop can share one registry.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory) -> Union[Counter, Histogram]:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = factory()
+        return metric
+
+    def inc(self, name: str, amount: float = 1):
+        """Add to a counter"""
+        with self._lock:
+            self._get(name, Counter).inc(amount)
+
+    def observe(self, name: str, value: float):
+        """Record one value (a duration in seconds) in a histogram"""
+        with self._lock:
+            self._get(name, Histogram).observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block into a histogram
+
+        Also usable around awaits in async code: the wall time includes them.
+        Blocks that raise are timed too.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        """Forget everything recorded"""
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get every metric as plain data (picklable, JSON-serializable)"""
+        with self._lock:
+            return {name: metric.snapshot() for name, metric in sorted(self._metrics.items())}
+
+    def merge(self, snapshot: Dict[str, Dict[str, Any]]):
+        """Add another registry's snapshot (e.g. from a worker process) into this one"""
+        with self._lock:
+            for name, data in snapshot.items():
+                self._get(name, Histogram if data['type'] == Histogram.kind else Counter).merge(data)
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, data in self.snapshot().items():
+            full_name = f"{NAMESPACE}_{name}"
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {full_name} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {full_name} {data['type']}")
+            if data['type'] == Counter.kind:
+                lines.append(f"{full_name} {data['value']:g}")
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip([*data['buckets'], '+Inf'], data['counts']):
+                cumulative += bucket_count
+                le = bound if isinstance(bound, str) else f"{bound:g}"
+                lines.append(f'{full_name}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{full_name}_sum {data['sum']:.6f}")
+            lines.append(f"{full_name}_count {data['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self) -> str:
+        """Render the metrics as JSON (histograms include p50/p95 estimates)"""
+        return json.dumps({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'metrics': self.snapshot()
+        }, indent=2)
+
+    def write(self, directory: Union[str, Path] = "logs") -> Tuple[Path, Path]:
+        """
+        Write metrics.prom and metrics.json
+
+        Args:
+            directory: Where to write them (next to bot.log by default)
+
+        Returns:
+            The paths written
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        prom_path = directory / "metrics.prom"
+        json_path = directory / "metrics.json"
+        prom_path.write_text(self.to_prometheus())
+        json_path.write_text(self.to_json())
+        return prom_path, json_path
+
+    def summary(self) -> List[str]:
+        """One line per recorded stage: count, mean, p50, p95 and total time; then the counters"""
+        lines = []
+        counters = []
+        for name, data in self.snapshot().items():
+            if data['type'] == Counter.kind:
+                counters.append(f"{name.removesuffix('_total')}={data['value']:g}")
+            elif data['count']:
+                lines.append(
+                    f"{name.removesuffix('_seconds'):<26} {data['count']:>6}x  "
+                    f"mean {data['sum'] / data['count'] * 1000:>8.1f} ms  "
+                    f"p50 {data['p50'] * 1000:>8.1f} ms  p95 {data['p95'] * 1000:>8.1f} ms  "
+                    f"total {data['sum']:>7.2f}s"
+                )
+        if counters:
+            lines.append(', '.join(counters))
+        return lines
+
+
+# The registry the scraper and database record into (one per process)
+metrics = MetricsRegistry()